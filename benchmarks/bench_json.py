@@ -0,0 +1,73 @@
+"""JsonType benchmark, decodes a large json array from @path with every installed decoder and in stream mode, each in
+a new interpreter so the peak memory of one mode does not hide another.
+
+    python benchmarks/bench_json.py --size-mb 500
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    'json': 'len(JsonType(decoder="json")(path))',
+    'fastest': 'len(JsonType(decoder="fastest")(path))',
+    'stream': 'sum(1 for _ in JsonType(stream=True)(path))',
+}
+
+RUN = '''
+import resource, sys, time
+from cloc.types import JsonType
+path = sys.argv[1]
+start = time.perf_counter()
+items = {expression}
+print(items, time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def write_array(path: str, size: int):
+    """write_array - write a json array of records to path until it is at least size bytes"""
+    import json
+
+    record = {'id': 0, 'name': 'resource', 'tags': ['a', 'b', 'c'], 'score': 0.5, 'active': True}
+    written = 0
+    with open(path, 'w') as fout:
+        fout.write('[')
+        while written < size:
+            record['id'] += 1
+            line = json.dumps(record)
+            fout.write(line if record['id'] == 1 else ',' + line)
+            written += len(line) + 1
+        fout.write(']')
+
+
+def main(argv: list = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=int, default=50, help='size of the json array to decode')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'array.json')
+        write_array(path, args.size_mb * 1024 * 1024)
+        print(f'{os.path.getsize(path) / 1024 / 1024:.0f} MB json array')
+        print(f'{"mode":>8} {"items":>10} {"seconds":>8} {"peak MB":>8}')
+        counts = set()
+        for mode, expression in MODES.items():
+            result = subprocess.run([sys.executable, '-c', RUN.format(expression=expression), f'@{path}'], cwd=ROOT,
+                                    capture_output=True, text=True)
+            if result.returncode:
+                print(f'{mode:>8} failed: {result.stderr.strip().splitlines()[-1]}')
+                return 1
+            items, seconds, peak = result.stdout.split()
+            counts.add(items)
+            print(f'{mode:>8} {items:>10} {float(seconds):>8.2f} {int(peak) / 1024:>8.0f}')
+    # every mode must decode the same number of items
+    return 0 if len(counts) == 1 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
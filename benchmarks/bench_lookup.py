@@ -0,0 +1,57 @@
+"""Lookup benchmark, shows that finding a command in a group takes the same time for 100 or 10,000 commands, by exact
+name, by unambiguous prefix and through the group parse.
+
+    python benchmarks/bench_lookup.py --max-ratio 3
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cloc.core import Cmd, Grp, Params
+
+
+def best(fn, number: int) -> float:
+    """best - fastest seconds of a call of fn over 5 repeats"""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def bench_lookup(sizes: tuple) -> list:
+    rows = []
+    for size in sizes:
+        grp = Grp('admin', lambda: None, params=Params(), prefix=True)
+        names = [f'tenant-{i:05d}-resource' for i in range(size)]
+        for name in names:
+            grp.add_command(Cmd(name, lambda: None, Params()))
+        sample = names[::max(1, size // 100)]
+        exact = best(lambda: [grp.get_command(name) for name in sample], 20) / len(sample)
+        grp.trie
+        prefix = best(lambda: [grp.get_command(name[:-3]) for name in sample], 20) / len(sample)
+        dispatch = best(lambda: [grp._parse([name, '--x', '1']) for name in sample], 20) / len(sample)
+        complete = best(lambda: grp.complete('tenant-0000'), 20)
+        rows.append((size, exact, prefix, dispatch, complete))
+    return rows
+
+
+def main(argv: list = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-ratio', type=float, default=3.0,
+                        help='most the time per lookup may grow from the smallest to the largest group')
+    args = parser.parse_args(argv)
+
+    print('lookup: exact name, unambiguous prefix, Grp parse and completion of 10 names')
+    print(f'{"commands":>8} {"exact ns":>10} {"prefix ns":>10} {"parse ns":>10} {"complete us":>12}')
+    rows = bench_lookup((100, 1000, 10000))
+    for size, exact, prefix, dispatch, complete in rows:
+        print(f'{size:>8} {exact * 1e9:>10.1f} {prefix * 1e9:>10.1f} {dispatch * 1e9:>10.1f} {complete * 1e6:>12.1f}')
+    ratio = max(rows[-1][i] / rows[0][i] for i in (1, 2, 3))
+    print(f'time per lookup grows {ratio:.2f}x from the smallest to the largest group')
+    return 1 if ratio > args.max_ratio else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
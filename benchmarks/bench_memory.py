@@ -0,0 +1,77 @@
+"""Memory benchmark, measures with tracemalloc the bytes each dataclass bound command adds to a command tree when
+viewsets are added to a group once per tenant.
+
+    python benchmarks/bench_memory.py --tenants 5000 --max-bytes 200
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cloc import grp, cmd, opt, flg
+from cloc.viewsets import GrpViewset
+
+
+class TenantViewset(GrpViewset):
+    """a viewset with a few commands that each have params"""
+
+    def __init__(self, tenant: str):
+        super().__init__()
+        self.tenant = tenant
+
+    @cmd('list')
+    @opt('--limit', '-l', type=int, default=10)
+    @flg('--all', '-a')
+    def list_command(self, limit, all):
+        pass
+
+    @cmd('show')
+    @opt('--id', '-i', type=str, required=True)
+    def show_command(self, id):
+        pass
+
+    @cmd('delete')
+    @opt('--id', '-i', type=str, required=True)
+    @flg('--force', '-f')
+    def delete_command(self, id, force):
+        pass
+
+
+def per_command(tenants: int) -> tuple:
+    """per_command - (bound commands, bytes allocated for each) of a group with a viewset per tenant"""
+    instances = [TenantViewset(f'tenant-{i}') for i in range(tenants)]
+
+    @grp('admin')
+    def admin():
+        pass
+
+    # commands of the class are found once, before measuring
+    admin.add_command(TenantViewset('warm'))
+    commands = len(admin.commands)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for instance in instances:
+        admin.add_command(instance)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    bound = len(admin.commands) - commands
+    return bound, (after - before) / bound
+
+
+def main(argv: list = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tenants', type=int, default=5000, help='viewsets to add to the group')
+    parser.add_argument('--max-bytes', type=float, default=200.0, help='most bytes a bound command may add')
+    args = parser.parse_args(argv)
+
+    bound, size = per_command(args.tenants)
+    print(f'{bound} bound commands, {size:.0f} bytes each (budget {args.max_bytes:.0f} bytes)')
+    return 1 if size > args.max_bytes else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
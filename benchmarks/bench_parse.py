@@ -0,0 +1,67 @@
+"""Parse benchmark, shows that parsing a command line scales linearly with its length for a command with many options.
+
+    python benchmarks/bench_parse.py --max-ratio 3
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cloc.core import Flg, Opt, Params
+
+
+def wide_params(options: int = 60) -> Params:
+    """wide_params - Params of a command with many options, a flag and a multiple option fed many values"""
+    order = [Opt(f'--option-{i}', f'-o{i}') for i in range(options)]
+    order += [Flg('--verbose', '-v'), Opt('--value', '-x', multiple=True)]
+    return Params(fn=lambda *values: None, order=order)
+
+
+def argv(values: int, options: int = 60) -> list:
+    """argv - a command line setting every option and the flag once and the multiple option values times"""
+    cmdl = [token for i in range(options) for token in (f'--option-{i}', str(i))] + ['-v']
+    for i in range(values):
+        cmdl += ['-x', str(i)]
+    return cmdl
+
+
+def best(fn, number: int) -> float:
+    """best - fastest seconds of a call of fn over 5 repeats"""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def bench_parse(sizes: tuple) -> list:
+    params = wide_params()
+    params.compile()
+    rows = []
+    for size in sizes:
+        cmdl = argv(size)
+        seconds = best(lambda: params.parse(cmdl), max(1, 200000 // len(cmdl)))
+        rows.append((size, len(cmdl), seconds, seconds / len(cmdl)))
+    return rows
+
+
+def main(argv: list = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-ratio', type=float, default=3.0,
+                        help='most the time per token may grow from the shortest to the longest command line')
+    args = parser.parse_args(argv)
+    failed = False
+
+    print('parse: 60 options, a flag and a multiple option')
+    print(f'{"values":>8} {"tokens":>8} {"ms/parse":>10} {"ns/token":>10}')
+    rows = bench_parse((10, 1000, 10000, 100000))
+    for size, tokens, seconds, per_token in rows:
+        print(f'{size:>8} {tokens:>8} {seconds * 1e3:>10.3f} {per_token * 1e9:>10.1f}')
+    ratio = rows[-1][3] / rows[0][3]
+    print(f'time per token grows {ratio:.2f}x from the smallest to the largest command line')
+    failed |= ratio > args.max_ratio
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
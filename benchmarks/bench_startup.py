@@ -0,0 +1,68 @@
+"""Startup benchmark, guards the import time of cloc with python -X importtime and checks that the modules cloc defers
+are not imported until they are used.
+
+    python benchmarks/bench_startup.py --budget-ms 25
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules that must not be imported by the import on the left
+DEFERRED = {
+    'import cloc': ('colored', 'requests', 'json', 'datetime', 'asyncio', 'cloc.types', 'cloc.streams'),
+    'from cloc.viewsets import ReadOnlyViewset': ('requests', 'colored'),
+}
+
+
+def import_time(statement: str) -> float:
+    """import_time - cumulative microseconds python -X importtime reports for the cloc package
+
+       Args:
+        statement {str} -- python statement that imports cloc
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.strip() == 'cloc':
+            return int(cumulative)
+    raise RuntimeError(f'cloc was not imported by {statement!r}')
+
+
+def imported(statement: str) -> set:
+    """imported - names of every module imported by a statement in a new interpreter"""
+    code = f'{statement}\nimport sys\nprint("\\n".join(sys.modules))'
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+def main(argv: list = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=25.0, help='most milliseconds import cloc may take')
+    parser.add_argument('--runs', type=int, default=15, help='imports to take the median of')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for statement, modules in DEFERRED.items():
+        found = sorted(set(modules) & imported(statement))
+        print(f'{statement!r}: deferred modules imported: {", ".join(found) or "none"}')
+        failed |= bool(found)
+
+    times = [import_time('import cloc') / 1000 for _ in range(args.runs)]
+    median = statistics.median(times)
+    print(f'import cloc: median {median:.2f} ms, min {min(times):.2f} ms, max {max(times):.2f} ms '
+          f'over {args.runs} runs (budget {args.budget_ms:.2f} ms)')
+    failed |= median > args.budget_ms
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,311 @@
+import sys
+
+from typing import Any, AsyncIterator, Iterable, Iterator, Union
+
+from cloc.core import BaseCmd
+from cloc.utils import capture, import_path
+
+"""
+Batch mode dispatches many command lines through one command tree in a single process. Every command line gets a
+BatchResult with its exit status and captured output. Command lines can be dispatched by threads (run), processes
+(run_processes) or as tasks on an event loop (arun).
+
+Formats for reading command lines:
+    lines -- one command line per line, split like a shell would split it
+    nul -- command lines delimited by a NUL byte, split like a shell would split it
+    json -- one json array of arguments per line
+"""
+
+FORMATS = ('lines', 'nul', 'json')
+
+
+class BatchResult(object):
+    """BatchResult - the result of one command line dispatched in batch mode
+
+       Args:
+        index {int} -- position of the command line in the batch
+        cmdl {list} -- the command line
+        exit_code {int} -- 0 on success, the code given to sys.exit or 1 if an exception was raised
+        output {str} -- everything written to stdout
+        error {str} -- everything written to stderr
+    """
+    __slots__ = ('index', 'cmdl', 'exit_code', 'output', 'error')
+
+    def __init__(self, index: int, cmdl: list, exit_code: int = 0, output: str = '', error: str = ''):
+        self.index = index
+        self.cmdl = cmdl
+        self.exit_code = exit_code
+        self.output = output
+        self.error = error
+
+    def to_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+def _split_records(stream: Any, delimiter: str, size: int = 65536) -> Iterator[str]:
+    remainder = ''
+    for chunk in iter(lambda: stream.read(size), ''):
+        records = (remainder + chunk).split(delimiter)
+        remainder = records.pop()
+        yield from records
+    if remainder:
+        yield remainder
+
+
+def read_cmdls(source: Union[str, Any] = None, format: str = 'lines') -> Iterator[list]:
+    """read_cmdls - lazily read command lines from a file path, '-' or None for stdin, or an open text stream
+
+       Args:
+        source {Union[str, Any]} -- file path or stream to read from
+        format {str} -- one of lines, nul, json
+    """
+    if format not in FORMATS:
+        raise ValueError(f'format must be one of {", ".join(FORMATS)}, got {format!r}')
+    if source is None or source == '-':
+        yield from read_cmdls(sys.stdin, format)
+        return
+    if isinstance(source, str):
+        with open(source) as fin:
+            yield from read_cmdls(fin, format)
+        return
+
+    if format == 'json':
+        import json
+
+        for line in source:
+            if line.strip():
+                yield [str(arg) for arg in json.loads(line)]
+    else:
+        import shlex
+
+        records = _split_records(source, '\0') if format == 'nul' else source
+        for record in records:
+            if record.strip():
+                yield shlex.split(record)
+
+
+def dispatch(command: BaseCmd, cmdl: list, index: int = 0) -> BatchResult:
+    """dispatch - invoke a command with a command line and capture the exit status and output
+
+       Args:
+        command {BaseCmd} -- command tree to dispatch through
+        cmdl {list} -- the command line
+        index {int} -- position of the command line in the batch
+    """
+    result = BatchResult(index, cmdl)
+    with capture() as (out, err):
+        try:
+            command(list(cmdl))
+        except SystemExit as e:
+            result.exit_code = _exit_code(e, err)
+        except Exception:
+            result.exit_code = _exception(err)
+    result.output = out.getvalue()
+    result.error = err.getvalue()
+    return result
+
+
+async def adispatch(command: BaseCmd, cmdl: list, index: int = 0) -> BatchResult:
+    """adispatch - await a command with a command line and capture the exit status and output,
+       output is captured per task so other command lines can run on the event loop at the same time
+
+       Args:
+        command {BaseCmd} -- command tree to dispatch through
+        cmdl {list} -- the command line
+        index {int} -- position of the command line in the batch
+    """
+    result = BatchResult(index, cmdl)
+    with capture() as (out, err):
+        try:
+            await command.dispatch(list(cmdl))
+        except SystemExit as e:
+            result.exit_code = _exit_code(e, err)
+        except Exception:
+            result.exit_code = _exception(err)
+    result.output = out.getvalue()
+    result.error = err.getvalue()
+    return result
+
+
+def _exit_code(e: SystemExit, err: Any) -> int:
+    if e.code is None or isinstance(e.code, int):
+        return e.code or 0
+    err.write(f'{e.code}\n')
+    return 1
+
+
+def _exception(err: Any) -> int:
+    import traceback
+
+    traceback.print_exc(file=err)
+    return 1
+
+
+def run(command: BaseCmd, cmdls: Iterable[list], workers: int = 1, ordered: bool = True) -> Iterator[BatchResult]:
+    """run - dispatch every command line through the command tree and yield a BatchResult for each
+
+       Args:
+        command {BaseCmd} -- command tree to dispatch through
+        cmdls {Iterable[list]} -- command lines, read lazily
+        workers {int} -- number of threads to dispatch with, 1 dispatches in the calling thread
+        ordered {bool} -- yield results in the order of the command lines, otherwise as they complete
+    """
+    if workers <= 1:
+        for index, cmdl in enumerate(cmdls):
+            yield dispatch(command, cmdl, index)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        tasks = ((dispatch, command, cmdl, index) for index, cmdl in enumerate(cmdls))
+        yield from submit(executor, tasks, workers * 4, ordered)
+
+
+def submit(executor: Any, tasks: Iterable[tuple], window: int, ordered: bool = True) -> Iterator[Any]:
+    """submit - submit (fn, *args) tasks to an executor and yield the results, only window tasks are submitted ahead
+       so a large batch is never held in memory
+
+       Args:
+        executor {Any} -- a concurrent.futures executor
+        tasks {Iterable[tuple]} -- (fn, *args) of every task, read lazily
+        window {int} -- most tasks submitted and not yet yielded
+        ordered {bool} -- yield results in the order of the tasks, otherwise as they complete
+    """
+    from collections import deque
+    from concurrent.futures import wait, FIRST_COMPLETED
+
+    pending = deque()
+    for fn, *args in tasks:
+        pending.append(executor.submit(fn, *args))
+        while len(pending) >= window or (pending and not ordered and pending[0].done()):
+            if ordered:
+                yield pending.popleft().result()
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                yield future.result()
+    while pending:
+        if ordered:
+            yield pending.popleft().result()
+            continue
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            yield future.result()
+
+
+async def arun(command: BaseCmd, cmdls: Iterable[list], limit: int = 64,
+               ordered: bool = True) -> AsyncIterator[BatchResult]:
+    """arun - dispatch every command line through the command tree as tasks on the running event loop and yield
+       a BatchResult for each, no more than limit command lines are dispatched at once
+
+       Args:
+        command {BaseCmd} -- command tree to dispatch through
+        cmdls {Iterable[list]} -- command lines, read lazily
+        limit {int} -- most command lines dispatched at once
+        ordered {bool} -- yield results in the order of the command lines, otherwise as they complete
+    """
+    import asyncio
+    from collections import deque
+
+    semaphore = asyncio.BoundedSemaphore(limit)
+
+    async def bounded(cmdl: list, index: int) -> BatchResult:
+        try:
+            return await adispatch(command, cmdl, index)
+        finally:
+            semaphore.release()
+
+    pending = deque()
+    try:
+        for index, cmdl in enumerate(cmdls):
+            await semaphore.acquire()
+            pending.append(asyncio.ensure_future(bounded(cmdl, index)))
+            if ordered:
+                # a slow command line holds back the results after it, wait for it before reading too far ahead
+                while pending and (pending[0].done() or len(pending) > limit * 4):
+                    yield await pending.popleft()
+            else:
+                for task in [task for task in pending if task.done()]:
+                    pending.remove(task)
+                    yield task.result()
+        while pending:
+            if ordered:
+                yield await pending.popleft()
+                continue
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.remove(task)
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+# the command tree of a worker process, built once by _init_worker when the process starts
+_worker_command = None
+
+
+def _init_worker(root: Union[str, BaseCmd]):
+    global _worker_command
+    _worker_command = import_path(root) if isinstance(root, str) else root
+
+
+def _dispatch_chunk(chunk: list) -> list:
+    return [dispatch(_worker_command, cmdl, index) for index, cmdl in chunk]
+
+
+def _chunks(cmdls: Iterable[list], chunksize: int) -> Iterator[list]:
+    chunk = []
+    for index, cmdl in enumerate(cmdls):
+        chunk.append((index, cmdl))
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_processes(root: Union[str, BaseCmd], cmdls: Iterable[list], processes: int = None, chunksize: int = 1,
+                  ordered: bool = True, mp_context: Any = None) -> Iterator[BatchResult]:
+    """run_processes - dispatch every command line through a pool of processes that each build the command tree once
+       when they start, only the command lines and results are sent between processes
+
+       Args:
+        root {Union[str, BaseCmd]} -- import path of the command tree ex: 'package.module:cli', a command tree object
+            can only be given when processes are started by fork
+        cmdls {Iterable[list]} -- command lines, read lazily
+        processes {int} -- number of worker processes, defaults to the number of cpus
+        chunksize {int} -- number of command lines sent to a worker at a time
+        ordered {bool} -- yield results in the order of the command lines, otherwise as they complete
+        mp_context {Any} -- multiprocessing context used to start the workers
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processes, mp_context=mp_context,
+                             initializer=_init_worker, initargs=(root,)) as executor:
+        tasks = ((_dispatch_chunk, chunk) for chunk in _chunks(cmdls, max(1, chunksize)))
+        for results in submit(executor, tasks, processes * 4, ordered):
+            yield from results
+
+
+def write(results: Iterable[BatchResult], stream: Any = None) -> int:
+    """write - write each result as a line of json and return the number of command lines that failed
+
+       Args:
+        results {Iterable[BatchResult]} -- results from run
+        stream {Any} -- text stream to write to, stdout by default
+    """
+    import json
+
+    stream = stream or sys.stdout
+    failed = 0
+    for result in results:
+        failed += result.exit_code != 0
+        stream.write(json.dumps(result.to_dict()) + '\n')
+    stream.flush()
+    return failed
@@ -0,0 +1,279 @@
+import os
+import threading
+import time
+
+from typing import Union
+
+"""
+An on-disk cache of GET responses for ReqSessionViewset. A response is stored under a key of the method, url, params,
+the request and session headers that can change the response, the auth and the cookies of the session, so sessions of
+different users can share a cache directory. Requests with an auth object other than a (user, password) tuple are
+never cached. A stored response is returned without a request while it is fresh by
+its Cache-Control max-age, once stale it is revalidated with If-None-Match or If-Modified-Since and a 304 returns the
+stored response. Responses with Cache-Control no-store, or with no max-age and no validator, are never stored.
+
+The least recently used responses are removed once the cache is larger than max_size. Hit and miss counters are kept in
+stats.json in the cache directory.
+"""
+
+# request headers that are part of the cache key
+VARY_HEADERS = ('accept', 'accept-encoding', 'accept-language', 'authorization', 'cookie')
+
+STATS = ('hits', 'misses', 'revalidated', 'stored', 'evicted')
+
+
+def _cache_control(value: str) -> dict:
+    directives = {}
+    for directive in (value or '').split(','):
+        name, _, arg = directive.strip().partition('=')
+        if name:
+            directives[name.lower()] = arg.strip('"')
+    return directives
+
+
+class ResponseCache(object):
+    """ResponseCache - size bounded on-disk cache of GET responses
+
+       Args:
+        directory {str} -- directory the responses and stats are saved to
+        max_size {int} -- most bytes of responses to keep, least recently used responses are removed first
+    """
+    directory: str
+    max_size: int
+
+    def __init__(self, directory: str, max_size: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = None
+        self._counts = dict.fromkeys(STATS, 0)
+        self._atexit = False
+
+    def key(self, method: str, url: str, params: dict = None, headers: dict = None, auth: tuple = None,
+            cookies: list = None) -> str:
+        """key - the cache key of a request
+
+           Args:
+            method {str} -- method of the request
+            url {str} -- url of the request
+            params {dict} -- params of the request
+            headers {dict} -- headers of the request merged with those of the session
+            auth {tuple} -- (user, password) of the request or session
+            cookies {list} -- (domain, path, name, value) of every cookie of the request and session
+        """
+        import hashlib
+        import json
+
+        headers = {k.lower(): str(v) for k, v in (headers or {}).items() if k.lower() in VARY_HEADERS}
+        params = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        auth = [str(part) for part in auth] if auth else None
+        cookies = sorted([str(part) for part in cookie] for cookie in cookies or ())
+        return hashlib.sha256(json.dumps([method.upper(), url, params, sorted(headers.items()), auth,
+                                          cookies]).encode()).hexdigest()
+
+    def get(self, session: 'requests.Session', url: str, params: dict = None, headers: dict = None,
+            **kwargs) -> 'requests.Response':
+        """get - session.get through the cache
+
+           Args:
+            session {requests.Session} -- session to make requests with
+            url {str} -- url for get requests
+            params {dict} -- params for get requests
+            headers {dict} -- headers for get requests
+        """
+        auth = kwargs.get('auth') or session.auth
+        if kwargs.get('data') or kwargs.get('stream') or (auth is not None and not isinstance(auth, (tuple, list))):
+            # an auth object can not be told apart from that of another user
+            return session.get(url, params=params, headers=headers, **kwargs)
+        # the headers requests sends, those of the request replace those of the session and None removes one
+        merged = {k.lower(): v for k, v in session.headers.items()}
+        merged.update({k.lower(): v for k, v in (headers or {}).items()})
+        merged = {k: v for k, v in merged.items() if v is not None}
+        cookies = [(c.domain, c.path, c.name, c.value) for c in session.cookies]
+        cookies += [('', '', name, value) for name, value in (kwargs.get('cookies') or {}).items()]
+        key = self.key('GET', url, params, merged, auth, cookies)
+        path = os.path.join(self.directory, key)
+        entry = self._read(path)
+        request_control = _cache_control(next((v for k, v in (headers or {}).items() if k.lower() == 'cache-control'),
+                                               None))
+        if entry is not None:
+            meta, content = entry
+            if 'no-cache' not in request_control and time.time() < meta['expires']:
+                self._count('hits')
+                self._touch(path)
+                return self._response(meta, content)
+            conditional = dict(headers or {})
+            if meta['headers'].get('etag'):
+                conditional['If-None-Match'] = meta['headers']['etag']
+            if meta['headers'].get('last-modified'):
+                conditional['If-Modified-Since'] = meta['headers']['last-modified']
+            response = session.get(url, params=params, headers=conditional, **kwargs)
+            if response.status_code == 304:
+                self._count('revalidated')
+                meta['headers'].update({k.lower(): v for k, v in response.headers.items()
+                                        if k.lower() in ('cache-control', 'date', 'expires', 'etag')})
+                meta['expires'] = self._expires(meta['headers'])
+                self._write(path, meta, content)
+                return self._response(meta, content)
+        else:
+            response = session.get(url, params=params, headers=headers, **kwargs)
+        self._count('misses')
+        self._store(path, response, request_control)
+        return response
+
+    def stats(self) -> dict:
+        """stats - hit and miss counters saved in the cache directory plus those of this process not yet saved,
+           with the number and size of stored responses
+        """
+        with self._lock:
+            counts = self._load_stats()
+            for name, count in self._counts.items():
+                counts[name] = counts.get(name, 0) + count
+        entries = self._entries()
+        counts.update(entries=len(entries), size=sum(size for _, size, _ in entries), max_size=self.max_size)
+        return counts
+
+    def save_stats(self):
+        """save_stats - add the counters of this process to stats.json, called when the process exits"""
+        import json
+
+        with self._lock:
+            if not any(self._counts.values()):
+                return
+            counts = self._load_stats()
+            for name, count in self._counts.items():
+                counts[name] = counts.get(name, 0) + count
+            self._counts = dict.fromkeys(STATS, 0)
+            tmp = os.path.join(self.directory, f'stats.json.{os.getpid()}.tmp')
+            with open(tmp, 'w') as fout:
+                json.dump(counts, fout)
+            os.replace(tmp, os.path.join(self.directory, 'stats.json'))
+
+    def _load_stats(self) -> dict:
+        import json
+
+        try:
+            with open(os.path.join(self.directory, 'stats.json')) as fin:
+                return json.load(fin)
+        except (OSError, ValueError):
+            return dict.fromkeys(STATS, 0)
+
+    def _count(self, name: str, count: int = 1):
+        with self._lock:
+            self._counts[name] += count
+            if not self._atexit:
+                import atexit
+
+                atexit.register(self.save_stats)
+                self._atexit = True
+
+    @staticmethod
+    def _expires(headers: dict) -> float:
+        control = _cache_control(headers.get('cache-control'))
+        if 'no-cache' in control:
+            return 0.0
+        try:
+            return time.time() + int(control.get('s-maxage') or control.get('max-age') or 0)
+        except ValueError:
+            return 0.0
+
+    @staticmethod
+    def _response(meta: dict, content: bytes) -> 'requests.Response':
+        from requests.models import Response
+        from requests.structures import CaseInsensitiveDict
+
+        response = Response()
+        response.status_code = meta['status']
+        response.reason = meta['reason']
+        response.url = meta['url']
+        response.encoding = meta['encoding']
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response._content = content
+        return response
+
+    def _store(self, path: str, response: 'requests.Response', request_control: dict):
+        if response.status_code != 200 or 'no-store' in request_control:
+            return
+        headers = {k.lower(): v for k, v in response.headers.items()}
+        control = _cache_control(headers.get('cache-control'))
+        if 'no-store' in control:
+            return
+        meta = {'status': response.status_code, 'reason': response.reason, 'url': response.url,
+                'encoding': response.encoding, 'headers': headers, 'expires': self._expires(headers)}
+        if meta['expires'] <= time.time() and 'etag' not in headers and 'last-modified' not in headers:
+            return
+        self._write(path, meta, response.content)
+        self._count('stored')
+
+    @staticmethod
+    def _read(path: str) -> Union[tuple, None]:
+        import json
+
+        try:
+            with open(path, 'rb') as fin:
+                meta = json.loads(fin.readline())
+                return meta, fin.read()
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _touch(path: str):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _write(self, path: str, meta: dict, content: bytes):
+        import json
+
+        try:
+            previous = os.path.getsize(path)
+        except OSError:
+            previous = 0
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as fout:
+            fout.write(json.dumps(meta).encode() + b'\n')
+            fout.write(content)
+            size = fout.tell()
+        os.replace(tmp, path)
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += size - previous
+            over = self._size > self.max_size
+        if over:
+            self._evict()
+
+    def _entries(self) -> list:
+        """(path, size, mtime) of every stored response"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if len(entry.name) == 64 and entry.is_file():
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        """remove the least recently used responses until the cache is smaller than max_size"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(size for _, size, _ in entries)
+        evicted = 0
+        for path, entry_size, _ in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            size -= entry_size
+            evicted += 1
+        with self._lock:
+            self._size = size
+        if evicted:
+            self._count('evicted', evicted)
+
@@ -1,10 +1,34 @@
 import sys
-import re
+import weakref
 
-from colored import fg, style
+from collections.abc import AsyncIterator, Awaitable, Coroutine, Iterator
 from typing import Any, Callable, List, Union
 
-from cloc.utils import trace, echo
+from cloc.utils import trace, echo, import_path
+
+
+def _run(value: Any) -> Any:
+    """run a coroutine returned by a command to completion on a new event loop, any other value is returned as is"""
+    if isinstance(value, Coroutine):
+        # asyncio is only imported for commands that are coroutines
+        import asyncio
+
+        return asyncio.run(value)
+    return value
+
+
+def _broken_pipe():
+    """exit once the reader of stdout is gone ex: | head, stdout is pointed at devnull so the output still buffered
+       is not flushed into the closed pipe at exit
+    """
+    import os
+
+    try:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    except (AttributeError, OSError, ValueError):
+        pass
+    sys.exit(1)
 
 
 class BaseArg(object):
@@ -21,6 +45,8 @@ class BaseArg(object):
     type: Any
     help: str
 
+    __slots__ = ('name', 'type', 'help')
+
     def __init__(self, name: str, type: Any = str, help: str = None):
         self.name = name
         self.type = type
@@ -31,6 +57,8 @@ class Arg(BaseArg):
     """Arg - A copy of BaseArg used for more explicit naming
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, type: Any = None, help: str = None):
         super().__init__(name, type, help)
 
@@ -52,6 +80,8 @@ class Opt(BaseArg):
     multiple: bool
     required: bool
 
+    __slots__ = ('short_name', 'default', 'multiple', 'required')
+
     def __init__(self, name: str, short_name: str, type: Any = str, default: Any = None,
                  multiple: bool = False, required: bool = False, help: str = None):
         super().__init__(name, type, help)
@@ -69,6 +99,8 @@ class Flg(BaseArg):
     """
     short_name: str
 
+    __slots__ = ('short_name',)
+
     def __init__(self, name: str, short_name: str, help: str = None):
         super().__init__(name, bool, help)
         self.short_name = short_name
@@ -80,6 +112,8 @@ class Params(object):
     fn: Callable
     order: List[Union[Arg, Opt, Flg]]
 
+    __slots__ = ('fn', 'order', '_compiled')
+
     def __init__(self, fn: Callable = None, order: List[Union[Arg, Opt, Flg]] = None):
         """initialize fn and order for Params
 
@@ -89,6 +123,99 @@ class Params(object):
         """
         self.fn = fn
         self.order = order or []
+        self._compiled = None
+
+    def insert(self, param: Union[Arg, Opt, Flg]):
+        """insert a param at the front of the order, params are decorated bottom up
+
+           Args:
+                param {Union[Arg, Opt, Flg]} -- param to add
+        """
+        self.order.insert(0, param)
+        self._compiled = None
+
+    def compile(self) -> tuple:
+        """compile the token table for the params, this is only built once per Params
+
+        returns tuple(token table {name|short_name: slot}, slots of each Arg in order)
+        """
+        if self._compiled is None:
+            table = {}
+            args = []
+            for slot, p in enumerate(self.order):
+                if isinstance(p, Arg):
+                    args.append(slot)
+                elif isinstance(p, (Opt, Flg)):
+                    table[p.name] = slot
+                    if p.short_name:
+                        table[p.short_name] = slot
+            self._compiled = (table, args)
+        return self._compiled
+
+    def parse(self, cmdl: list, commands: Callable = None, on_help: Callable = None) -> tuple:
+        """parse the command line state in a single pass, filling a slot for every param
+
+           Args:
+                cmdl {list} -- the state of the command line
+                commands {Callable} -- lookup for command names, the first positional found stops the parse. Called
+                    with the token and whether every Arg has a value, only then may a prefix find a command
+                on_help {Callable} -- called when --help is found before a command, before any value is converted
+
+        returns tuple(values to be unpacked into fn, index of the command found or len(cmdl))
+        """
+        table, args = self.compile()
+        slots = [None] * len(self.order)
+        size = len(cmdl)
+        position = 0
+        index = 0
+        while index < size:
+            token = cmdl[index]
+            slot = table.get(token)
+            if slot is not None:
+                if isinstance(self.order[slot], Flg):
+                    slots[slot] = True
+                    index += 1
+                    continue
+                if index + 1 < size and cmdl[index + 1]:
+                    if slots[slot] is None:
+                        slots[slot] = []
+                    slots[slot].append(cmdl[index + 1])
+                index += 2
+                continue
+            if commands is not None and token and commands(token, position == len(args)):
+                break
+            if token == '--help' and on_help is not None:
+                on_help()
+            if token and position < len(args):
+                if token.startswith('-'):
+                    msg = f'An {"opt"!r} was found: {token!r}, '
+                    msg += f'instead of type {"arg"!r}. Order of cmd parameters might be incorrect.'
+                    trace(msg, AssertionError, exit_code=1, color='red')
+                slots[args[position]] = token
+                position += 1
+            index += 1
+
+        values = []
+        for p, value in zip(self.order, slots):
+            if isinstance(p, Arg):
+                if value is not None:
+                    values.append(p.type(value))
+            elif isinstance(p, Opt):
+                if value and p.multiple:
+                    # types can convert every value of a multiple opt at once, ex: into one array
+                    convert_many = None if isinstance(p.type, type) else getattr(p.type, 'convert_many', None)
+                    values.append(convert_many(value) if convert_many else [p.type(v) for v in value])
+                elif value:
+                    values.append(p.type(value[0]))
+                elif p.required:
+                    trace(f'{p.name!r} is required', AssertionError, exit_code=1, color='red')
+                elif p.default is None:
+                    values.append(None)
+                else:
+                    values.append(p.type(p.default))
+            elif isinstance(p, Flg):
+                values.append(bool(value))
+        return values, index
 
     def get_help(self, name: str) -> tuple:
         """this method for Params will return a tuple of the usage string and parameter table (if exists)
@@ -98,6 +225,8 @@ class Params(object):
 
         returns tuple(usage, parameter table)
         """
+        from colored import fg, style
+
         usage = f'\n{fg("blue")}USAGE: {name} '
         params = ''
         tbl = ''
@@ -121,16 +250,121 @@ class Params(object):
         return usage, params + tbl
 
 
+class CommandTrie(object):
+    """CommandTrie - prefix tree of command names used for unambiguous prefix dispatch and completion
+
+        every node is a list of [children, number of names below the node, last name added below, terminal name]
+    """
+    root: list
+
+    __slots__ = ('root',)
+
+    def __init__(self, names: List[str] = None):
+        self.root = [{}, 0, None, None]
+        for name in names or []:
+            self.insert(name)
+
+    def insert(self, name: str):
+        """insert a name into the trie, names are expected to be unique
+
+           Args:
+                name {str} -- command name
+        """
+        node = self.root
+        node[1] += 1
+        node[2] = name
+        for char in name:
+            node = node[0].setdefault(char, [{}, 0, None, None])
+            node[1] += 1
+            node[2] = name
+        node[3] = name
+
+    def _find(self, prefix: str):
+        node = self.root
+        for char in prefix:
+            node = node[0].get(char)
+            if node is None:
+                return None
+        return node
+
+    def resolve(self, prefix: str) -> Union[str, None]:
+        """resolve a prefix to the full name, an exact name always wins over a longer name
+
+           Args:
+                prefix {str} -- the start of a command name
+
+        returns the full name or None if no name or more than one name starts with the prefix
+        """
+        node = self._find(prefix)
+        if node is None:
+            return None
+        if node[3] is not None:
+            return node[3]
+        return node[2] if node[1] == 1 else None
+
+    def complete(self, prefix: str = '') -> List[str]:
+        """complete a prefix to every name that starts with it, in sorted order
+
+           Args:
+                prefix {str} -- the start of a command name
+        """
+        node = self._find(prefix)
+        names = []
+        stack = [node] if node is not None else []
+        while stack:
+            node = stack.pop()
+            if node[3] is not None:
+                names.append(node[3])
+            stack.extend(node[0][char] for char in sorted(node[0], reverse=True))
+        return names
+
+
+class ParseResult(object):
+    """ParseResult - the state of a single invocation, a new result is returned by every parse so a command
+       tree is never modified by being invoked and can be reused or shared between threads
+
+       Args:
+        values {list} -- values that are going to be unpacked into the user defined function
+        invoke {str} -- the name found in the command line of the command to invoke next (Grp only)
+        cmdl {list} -- the command line state to pass to the invoked command (Grp only)
+    """
+    values: list
+    invoke: str
+    cmdl: list
+
+    __slots__ = ('values', 'invoke', 'cmdl')
+
+    def __init__(self, values: list = None, invoke: str = '', cmdl: list = None):
+        self.values = values or []
+        self.invoke = invoke
+        self.cmdl = cmdl or []
+
+
+class _Doc(object):
+    """_Doc - __doc__ of a command class, the class docstring on the class and the docstring of the decorated
+       function on a command, commands use __slots__ so the docstring is kept in the doc slot
+    """
+    __slots__ = ('doc',)
+
+    def __init__(self, doc: str):
+        self.doc = doc
+
+    def __get__(self, instance, owner):
+        return self.doc if instance is None else instance.doc
+
+    def __set__(self, instance, value: str):
+        instance.doc = value
+
+
 class BaseCmd(object):
     """BaseCmd - Base implementation of a full command that may or may not include one to many arg, opt, or flg
 
        Args:
         name {str} -- name used to invoke and track command
         hidden {bool} -- False = Command will be shown; True = Command will not be shown but can be invoked
-        help {str} -- help string that will be built to display on --help
+        help {str} -- help string that is built on first display of --help and cached on the command
         params {Params} -- Params declared by the user [arg, opt, and/or flg]
-        regex_patters {list} -- list of regex patterns to match opt and flg against, do not override
-        values {list} -- values that are going to be unpacked into the user defined Cmd function
+        doc {str} -- docstring shown in help, also returned by __doc__ of the command
 
         A BaseCmd cannot be invoked itself. This class must be inherited and completed to correctly run
     """
@@ -138,36 +372,42 @@ class BaseCmd(object):
     hidden: bool
     help: str
     params: Params
-    regex_patterns: list
-    values: list
+
+    __slots__ = ('name', 'params', 'hidden', 'doc', '_help')
 
     def __init__(self, name: str, params: Params = None, hidden: bool = False):
         self.name = name
         self.params = params
         self.hidden = hidden
-        self.help = ''
-        self.regex_patterns = []
-        self.values = []
-
-    def _print_help(self):
+        self.doc = None
+        self._help = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.__doc__ = _Doc(cls.__dict__.get('__doc__'))
+
+    @property
+    def help(self) -> str:
+        """help - the help string, only built by create_help when it is first needed"""
+        if self._help is None:
+            built = self.create_help()
+            # an overloaded create_help may still set self.help instead of returning it
+            if self._help is None:
+                self._help = built or ''
+        return self._help
+
+    @help.setter
+    def help(self, value: str):
+        self._help = value
+
+    def _print_help(self, exit_code: int = 0):
         """_print_help - protected method to print the built help string
             this could in theory be overloaded to also add content to help string before print
-        """
-        trace(self.help)
 
-    def create_regex_patterns(self):
-        """create_regex_patterns - create regex patterns for each opt and flg param
-            - this allows an easy matching on the entire command line string to opt and flg
-            - an empty entry means there was an arg in place, this is indexed for double check later on
+           Args:
+            exit_code {int} -- exit code after the help is printed, 0 when help was asked for
         """
-        escape_dash = '\\-'
-        if hasattr(self, 'params') and hasattr(self.params, 'order'):
-            for p in reversed(self.params.order):
-                rgx_pattern = ''
-                if isinstance(p, Flg):
-                    rgx_pattern += f'(-{f"{escape_dash}"}{p.name.replace("-", "")}|'
-                    rgx_pattern += f'-{p.short_name.replace("-", "")})'
-                self.regex_patterns.insert(0, rgx_pattern)
+        trace(self.help, exit_code=exit_code)
 
     def create_help(self):
         """create_help - a formatted and colored help string, can be overloaded for different formatting
@@ -179,25 +419,39 @@ class BaseCmd(object):
             4. parameters
 
         """
+        from colored import fg, style
+
         name = f'\n{fg("green")}{self.name.title()}{style.RESET}\n'
-        doc = f'\n{fg("yellow")}\t{self.__doc__}{style.RESET}\n'
+        doc = f'\n{fg("yellow")}\t{self.doc}{style.RESET}\n'
         usage, params = self.params.get_help(self.name)
-        self.help = name + doc + usage + params
+        return name + doc + usage + params
 
-    def get_values(self, cmdl: list):
+    def get_values(self, cmdl: list) -> ParseResult:
         """This is to be implemented by classes that inherit BaseCmd"""
-        pass
+        return ParseResult()
 
-    def _parse(self, cmdl: list):
-        """_parse - protected method to initialize the BaseCmd (creates help msg, create param regex patters, and
-           get parameter values from the input into parse -> should represent the latest state of the command line.
+    def _parse(self, cmdl: list) -> ParseResult:
+        """_parse - protected method to get parameter values from the input into parse -> should represent the
+           latest state of the command line. The help msg is built lazily.
 
            Args:
             cmdl {list} -- the state of the command line
+
+        returns ParseResult for this invocation
         """
-        self.create_help()
-        self.create_regex_patterns()
-        self.get_values(cmdl)
+        return self.get_values(cmdl)
+
+    async def dispatch(self, cmdl: list = None) -> Any:
+        """dispatch - awaitable invoke of the command, coroutine callbacks are awaited on the running event loop
+           so many command lines can be dispatched concurrently
+
+           Args:
+            cmdl {list} -- the state of the command line
+        """
+        return self(cmdl)
+
+
+BaseCmd.__doc__ = _Doc(BaseCmd.__doc__)
 
 
 class Cmd(BaseCmd):
@@ -206,17 +460,30 @@ class Cmd(BaseCmd):
        Args:
         fn {Callable} -- the function that got originally decorated
         dataclass {object} -- a Cmd can also become a dataclass Cmd that will allow commands to inherit a self
-            attribute which will be added to self.values[0]. This allows commands to become tied to objects to allow
+            attribute which will be added to values[0]. This allows commands to become tied to objects to allow
             manipulation of class attributes
+        output {str} -- format to stream an iterator returned by fn to stdout in, one of lines, ndjson, csv, json,
+            None returns the iterator
     """
     fn: Callable
     dataclass: object
+    output: str
 
-    def __init__(self, name: str, fn: Callable, params: Params = None, hidden: bool = False):
+    __slots__ = ('fn', 'dataclass', 'output')
+
+    def __init__(self, name: str, fn: Callable, params: Params = None, hidden: bool = False,
+                 output: str = None):
         super().__init__(name, params, hidden)
+        if output is not None:
+            # streams is only imported by commands that stream
+            from cloc.streams import OUTPUT_FORMATS
+
+            if output not in OUTPUT_FORMATS:
+                raise ValueError(f'output must be one of {", ".join(OUTPUT_FORMATS)} or None, got {output!r}')
         self.fn = fn
         self.dataclass = None
-        self.__doc__ = fn.__doc__
+        self.doc = fn.__doc__
+        self.output = output
 
     def __call__(self, cmdl: list = None):
         """This method will invoke the command with the given cmdl state
@@ -231,23 +498,58 @@ class Cmd(BaseCmd):
             if self has the attribute of dataclass set, values[0] = dataclass = class that is connected to command
             now command should have a self as first arg or this will override first arg
 
+            a command defined with async def is run to completion on a new event loop, if output is set an iterator
+            or async iterator returned by the command is written to stdout as it is read in the output format
+        """
+        return self._stream(_run(self.fn(*self._values(cmdl))))
+
+    async def dispatch(self, cmdl: list = None) -> Any:
+        """dispatch - overloaded function, awaits the command if it was defined with async def
+
+           Args:
+            cmdl {list} -- the current state of the command line
         """
-        self._parse(cmdl or sys.argv[1:])
+        value = self.fn(*self._values(cmdl))
+        if isinstance(value, Awaitable):
+            value = await value
+        if self.output is not None and isinstance(value, AsyncIterator):
+            from cloc.streams import awrite_records
+
+            try:
+                return await awrite_records(value, self.output)
+            except BrokenPipeError:
+                _broken_pipe()
+        return self._stream(value)
+
+    def _stream(self, value: Any) -> Any:
+        """write an iterator returned by fn to stdout in the output format, an open file is returned as is"""
+        if self.output is None or not isinstance(value, (Iterator, AsyncIterator)) or hasattr(value, 'fileno'):
+            return value
+        from cloc.streams import awrite_records, write_records
+
+        try:
+            if isinstance(value, AsyncIterator):
+                return _run(awrite_records(value, self.output))
+            return write_records(value, self.output)
+        except BrokenPipeError:
+            _broken_pipe()
+
+    def _values(self, cmdl: list) -> list:
+        values = self._parse(sys.argv[1:] if cmdl is None else cmdl).values
 
         # this should represent 'self' for the command about to start
         if self.dataclass:
-            self.values.insert(0, self.dataclass)
-
-        return self.fn(*self.values) if self.values else self.fn()
+            values.insert(0, self.dataclass)
+        return values
 
     @classmethod
     def create_new_cmd(cls, name: str, fn: Callable, params: Params = None,
-                       hidden: bool = False):
-        return cls(name, fn, params=params, hidden=hidden)
+                       hidden: bool = False, output: str = None):
+        return cls(name, fn, params=params, hidden=hidden, output=output)
 
     @classmethod
     def create_new_dataclass_cmd(cls, name: str, fn: Callable, params: Params = None,
-                                 hidden: bool = False, dataclass: object = None):
+                                 hidden: bool = False, dataclass: object = None, output: str = None):
         """create_new_dataclass_cmd - get a new cls of Cmd that is tied to another class
 
            Args:
@@ -255,12 +557,30 @@ class Cmd(BaseCmd):
             hidden {bool} -- False = Command will be shown; True = Command will not be shown but can be invoked
             params {Params} -- Params declared by the user [arg, opt, and/or flg]
             dataclass {object} -- new command dataclass = dataclass
+            output {str} -- format to stream an iterator returned by fn in
         """
-        new_cmd = cls(name, fn, params, hidden)
+        new_cmd = cls(name, fn, params, hidden, output)
         new_cmd.dataclass = dataclass
         return new_cmd
 
-    def get_values(self, cmdl: list):
+    def bind(self, dataclass: object) -> 'Cmd':
+        """bind - get a dataclass Cmd tied to another class, the new Cmd shares the name, fn, params
+           and help of this Cmd instead of being built again
+
+           Args:
+            dataclass {object} -- new command dataclass = dataclass
+        """
+        bound = object.__new__(type(self))
+        for klass in type(self).__mro__:
+            for slot in getattr(klass, '__slots__', ()):
+                if hasattr(self, slot):
+                    setattr(bound, slot, getattr(self, slot))
+        if hasattr(self, '__dict__'):
+            bound.__dict__.update(self.__dict__)
+        bound.dataclass = dataclass
+        return bound
+
+    def get_values(self, cmdl: list) -> ParseResult:
         """get_values - overloaded function, this method will create the values to be unpacked
            into the Cmd function. If --help is anywhere is cmdl, the help message will be printed.
 
@@ -270,41 +590,80 @@ class Cmd(BaseCmd):
         """
         if '--help' in cmdl:
             self._print_help()
-        if hasattr(self, 'params') and hasattr(self.params, 'order'):
-            while len(cmdl) < len(self.params.order):
-                cmdl.append('')
-            for index in range(0, len(self.params.order)):
-                if isinstance(self.params.order[index], Arg):
-                    if cmdl[index].startswith('-'):
-                        msg = f'An {"opt"!r} was found: {cmdl[index]!r}, '
-                        msg += f'instead of type {"arg"!r}. Order of cmd parameters might be incorrect.'
-                        trace(msg, AssertionError, color='red')
-                    if len(cmdl) >= index + 1 and cmdl[index + 1]:
-                        self.values.append(self.params.order[index].type(cmdl[index + 1]))
-                if isinstance(self.params.order[index], Opt):
-                    values = []
-                    for cmdl_index in range(0, len(cmdl)):
-                        if cmdl[cmdl_index] == self.params.order[index].name or \
-                                cmdl[cmdl_index] == self.params.order[index].short_name:
-                            if len(cmdl) >= cmdl_index + 1 and cmdl[cmdl_index + 1]:
-                                values.append(self.params.order[index].type(cmdl[cmdl_index + 1]))
-
-                    if self.params.order[index].required and not values:
-                        msg = f'{self.params.order[index].name!r} is required'
-                        trace(msg, AssertionError, color='red')
-
-                    if len(values) > 0:
-                        if self.params.order[index].multiple:
-                            self.values.append(values)
-                        else:
-                            self.values.append(values[0])
-                    elif self.params.order[index].default is None:
-                        self.values.append(self.params.order[index].default)
-                    elif self.params.order[index].default:
-                        self.values.append(self.params.order[index].type(self.params.order[index].default))
-                if isinstance(self.params.order[index], Flg):
-                    matches = re.findall(self.regex_patterns[index], ' '.join(cmdl))
-                    self.values.append(True) if matches else self.values.append(False)
+        values, _ = self.params.parse(cmdl)
+        return ParseResult(values)
+
+
+class LazyCmd(BaseCmd):
+    """LazyCmd - Inherits from BaseCmd, a placeholder for a Cmd or Grp that is only imported when it is invoked
+
+       Args:
+        path {str} -- import path of the command ex: 'package.module:command'
+            a path to a Cmd on an instance 'package.module:instance.command' will make a dataclass Cmd
+        doc {str} -- description to show in the help of a Grp, the command is not imported to build help
+
+        LazyCmd allows a Grp to list and dispatch to commands without importing them ahead of time
+    """
+    path: str
+
+    __slots__ = ('path', '_command')
+
+    def __init__(self, name: str, path: str, doc: str = None, hidden: bool = False):
+        super().__init__(name, Params(), hidden)
+        self.path = path
+        self.doc = doc
+        self._command = None
+
+    def __call__(self, cmdl: list = None):
+        """import the command on first call and invoke it with the given cmdl state
+
+           Args:
+            cmdl {list} -- the current state of the command line
+        """
+        return self.resolve()(cmdl)
+
+    async def dispatch(self, cmdl: list = None) -> Any:
+        """import the command on first dispatch and await it with the given cmdl state
+
+           Args:
+            cmdl {list} -- the current state of the command line
+        """
+        return await self.resolve().dispatch(cmdl)
+
+    def resolve(self) -> BaseCmd:
+        """resolve - import the command the first time it is needed"""
+        if self._command is None:
+            command = import_path(self.path)
+            module, _, attributes = self.path.partition(':')
+            owner_path, _, _ = attributes.rpartition('.')
+            if isinstance(command, Cmd) and command.dataclass is None and owner_path:
+                owner = import_path(f'{module}:{owner_path}')
+                if not isinstance(owner, type):
+                    command = command.bind(owner)
+            self._command = command
+        return self._command
+
+
+_CLASS_COMMANDS = weakref.WeakKeyDictionary()
+
+
+def class_commands(cls: type) -> tuple:
+    """class_commands - find the Cmd attributes of a class and its bases, ordered by attribute name.
+       The class __dict__ of each class in the MRO is only walked the first time a class is seen
+
+       Args:
+        cls {type} -- class to find commands in
+    """
+    commands = _CLASS_COMMANDS.get(cls)
+    if commands is None:
+        found = {}
+        for klass in cls.__mro__:
+            for attribute, value in vars(klass).items():
+                # the first class in the mro with the attribute wins, even if it is not a Cmd
+                found.setdefault(attribute, value)
+        commands = tuple(found[attribute] for attribute in sorted(found) if isinstance(found[attribute], Cmd))
+        _CLASS_COMMANDS[cls] = commands
+    return commands
 
 
 class Grp(BaseCmd):
@@ -314,25 +673,30 @@ class Grp(BaseCmd):
 
        Args:
         commands {List[Cmd]} -- a list of Cmd objects
-        invoke {str} -- the string found in command line to invoke a command
-        cmdl {list} -- the command line state, if not provided sys.argv[1:] is default
+        prefix {bool} -- allow a command to be invoked by any unambiguous prefix of its name
 
     """
     commands: List[Cmd]
-    cmdl: list
     fn: Callable
     params: Params
     dataclass: object
-    invoke: str  # this is here in the case you want to manually set a cmd to call in self.commands
+    prefix: bool
+
+    __slots__ = ('commands', 'fn', 'prefix', '_index', '_trie')
 
     def __init__(self, name: str, fn: Callable, commands: List[Cmd] = None, params: Params = None,
-                 hidden: bool = False):
+                 hidden: bool = False, prefix: bool = False):
         super().__init__(name, params=params, hidden=hidden)
-        self.commands = commands or []
+        self.commands = []
         self.fn = fn
         self.params = params
-        self.__doc__ = fn.__doc__
-        self.invoke = ''
+        self.prefix = prefix
+        self.doc = fn.__doc__
+        # name -> command index kept in sync by add_command, the trie is only built when needed
+        self._index = {}
+        self._trie = None
+        for command in commands or []:
+            self._add(command)
 
     def __call__(self, cmdl: list = None):
         """__call__ overloading call method to make a Grp hold states and shift the cmdl to another Grp
@@ -340,66 +704,156 @@ class Grp(BaseCmd):
            Args:
             cmdl {list} -- command line state
 
-            1. call the _parse command from BaseCmd to intialize the group (will update the state of cmdl)
+            1. call the _parse command from BaseCmd to get the ParseResult (holds the next state of cmdl)
             2. check if an invoke string has been found
             3. if invoke is found, get command that matches the name
             4. if there is a Cmd that matches, check if the instance is a Grp or Cmd
             5. if Grp, call the Cmd with the state of cmdl; if Cmd, call Cmd.start(cmdl) to invoke the command
 
+            if the Grp function is a coroutine, it and the invoked command are run on one new event loop
+        """
+        result = self._parse(sys.argv[1:] if cmdl is None else cmdl)
+        value = self.fn(*result.values)
+        if isinstance(value, Coroutine):
+            return _run(self._resume(value, result))
+        return self._invoked(result)(result.cmdl)
+
+    async def dispatch(self, cmdl: list = None) -> Any:
+        """dispatch - overloaded function, awaits the Grp function if it was defined with async def then
+           dispatches the invoked command
+
+           Args:
+            cmdl {list} -- command line state
         """
-        # need to rework to also call grp function to chain both and allow grp to have opt and flg
-        self.cmdl = cmdl or sys.argv[1:]
-        self._parse(self.cmdl)
-        self.fn(*self.values)
-
-        # check if command was found to invoke
-        if self.invoke:
-            cmd = self.get_command(self.invoke)
+        result = self._parse(sys.argv[1:] if cmdl is None else cmdl)
+        return await self._resume(self.fn(*result.values), result)
+
+    async def _resume(self, value: Any, result: ParseResult) -> Any:
+        """await the value of the Grp function and dispatch the invoked command"""
+        if isinstance(value, Awaitable):
+            await value
+        return await self._invoked(result).dispatch(result.cmdl)
+
+    def _invoked(self, result: ParseResult) -> BaseCmd:
+        """_invoked - protected method to find the command invoked by a ParseResult, prints the help message
+           and exits if there is none
+
+           Args:
+            result {ParseResult} -- parse result of this Grp
+        """
+        if result.invoke:
+            cmd = self.get_command(result.invoke)
             if cmd:
-                cmd(self.cmdl)
-            else:
-                echo(f'command {self.invoke!r} was not found', color='red')
-                self._print_help()
-        else:
-            self._print_help()
+                return cmd
+            echo(f'command {result.invoke!r} was not found', color='red')
+        self._print_help(1)
 
-    def add_command(self, command: BaseCmd, hidden: bool = None):
+    def add_command(self, command: Union[BaseCmd, str], hidden: bool = None, name: str = None, help: str = None):
         """add_command - add a new command to the Grp. A command can either be a Cmd or Grp.
             Can also override or set hidden state
 
            Args:
-            command {BaseCmd} -- a Grp or Cmd to add to current Grp
+            command {Union[BaseCmd, str]} -- a Grp, Cmd or LazyCmd to add to current Grp, or the import path of one
             hidden {bool} -- flag for hiding Grp or Cmd
+            name {str} -- name to list and invoke a command given by import path, defaults to the last attribute in
+                the path, ex: get_command for 'package.module:get_command', not the name the Cmd was made with
+            help {str} -- description for the help message of a command given by import path
 
             this method will also make a new dataclass Cmd if needed. If a command is found inside a class,
             initiate a dataclass Cmd to be made. Setting dataclass = class that declared the commands.
             This attributes are now tied to this dataclass Cmd to allow a MVC CLI capability
             - a dataclass Cmd is the magic to allow Cli Viewsets and Querysets
+
+            a command given by import path ex: 'package.module:command' is added as a LazyCmd, the module
+            is only imported when the command is invoked
         """
-        if not isinstance(command, (Grp, Cmd)):
+        # the command table in the help message is now out of date
+        self._help = None
+        if isinstance(command, str):
+            name = name or command.rpartition(':')[2].rpartition('.')[2]
+            self._add(LazyCmd(name, command, help, bool(hidden)))
+        elif not isinstance(command, BaseCmd):
             # look for groups or commands in this class and make them dataclass commands
-            for method_name in dir(command):
-                method = getattr(command, method_name)
-                if isinstance(method, Cmd):
-                    cmd = method.create_new_dataclass_cmd(method.name, method.fn, method.params, method.hidden, command)
-                    if cmd:
-                        self.commands.append(cmd)
+            for method in class_commands(type(command)):
+                self._add(method.bind(command))
 
         else:
             if hidden:
                 command.hidden = hidden
-            self.commands.append(command)
+            self._add(command)
 
-    def get_command(self, name: str):
-        """get_command - find command by name and return the command
+    def _add(self, command: BaseCmd):
+        """_add - protected method to append a command and index it by name, the first command added with a name wins
+
+           Args:
+            command {BaseCmd} -- command to add
+        """
+        self.commands.append(command)
+        if command.name not in self._index:
+            self._index[command.name] = command
+            if self._trie is not None:
+                self._trie.insert(command.name)
+
+    @property
+    def trie(self) -> CommandTrie:
+        """trie - CommandTrie of the command names, built on first use"""
+        if self._trie is None:
+            self._trie = CommandTrie(list(self._index))
+        return self._trie
+
+    def get_command(self, name: str, prefix: bool = True):
+        """get_command - find command by name and return the command, if the Grp allows prefix dispatch
+            an unambiguous prefix of a name will also find the command
 
            Args:
             name {str} -- name to search
+            prefix {bool} -- resolve a prefix when the Grp allows it, an empty name is never a prefix
+        """
+        command = self._index.get(name)
+        if command is None and self.prefix and prefix and name:
+            full_name = self.trie.resolve(name)
+            if full_name is not None:
+                return self._index[full_name]
+        return command
+
+    def complete(self, prefix: str = '') -> List[str]:
+        """complete - names of the commands that are not hidden and start with prefix
+
+           Args:
+            prefix {str} -- the start of a command name
+        """
+        return [name for name in self.trie.complete(prefix) if not self._index[name].hidden]
+
+    def batch(self, source: Any = None, format: str = 'lines', workers: int = 1, ordered: bool = True):
+        """batch - dispatch many command lines through this Grp in one process, see cloc.batch
+
+           Args:
+            source {Any} -- file path, stream or '-' for stdin (default) to read command lines from
+            format {str} -- lines, nul (NUL delimited command lines) or json (one json array per line)
+            workers {int} -- number of threads to dispatch with
+            ordered {bool} -- yield results in the order of the command lines, otherwise as they complete
+
+        returns a generator of cloc.batch.BatchResult with the exit code and captured output of each command line
         """
-        for c in self.commands:
-            if name == c.name:
-                return c
-        return None
+        from cloc import batch
+
+        return batch.run(self, batch.read_cmdls(source, format), workers=workers, ordered=ordered)
+
+    def abatch(self, source: Any = None, format: str = 'lines', limit: int = 64, ordered: bool = True):
+        """abatch - dispatch many command lines through this Grp concurrently on the running event loop,
+           see cloc.batch
+
+           Args:
+            source {Any} -- file path, stream or '-' for stdin (default) to read command lines from
+            format {str} -- lines, nul (NUL delimited command lines) or json (one json array per line)
+            limit {int} -- most command lines dispatched at once
+            ordered {bool} -- yield results in the order of the command lines, otherwise as they complete
+
+        returns an async generator of cloc.batch.BatchResult
+        """
+        from cloc import batch
+
+        return batch.arun(self, batch.read_cmdls(source, format), limit=limit, ordered=ordered)
 
     def get_command_names(self):
         """get_command_names - return all names of commands found in the Grp
@@ -414,8 +868,10 @@ class Grp(BaseCmd):
             3. list of commands in Grp
 
         """
+        from colored import fg, style
+
         namestr = f'\n{fg("green")}{self.name.title()}{style.RESET}\n'
-        doc = f'\n{fg("yellow")}\t{self.__doc__}{style.RESET}\n'
+        doc = f'\n{fg("yellow")}\t{self.doc}{style.RESET}\n'
         cmdstr = ''
         grp_tbl = ''
         usage, params = self.params.get_help(self.name)
@@ -425,68 +881,27 @@ class Grp(BaseCmd):
             grp_tbl += f'| {"-" * 24} | {"-" * 52} |\n'
             for c in self.commands:
                 grp_tbl += f'{fg("red")}| {style.RESET}{c.name:<24} {fg("red")}| '
-                grp_tbl += f'{style.RESET}{"".join(str(c.__doc__)[:50]):<52} {fg("red")}|\n'
+                grp_tbl += f'{style.RESET}{"".join(str(c.doc)[:50]):<52} {fg("red")}|\n'
             grp_tbl += f'{style.RESET}'
         usage = usage + ' ' + '|'.join(self.get_command_names())
-        self.help = namestr + doc + usage + params + cmdstr + grp_tbl
+        return namestr + doc + usage + params + cmdstr + grp_tbl
 
-    def get_values(self, cmdl: list):
-        """get_values - overloaded function, from the command line state, get the command to invoke and set name
+    def get_values(self, cmdl: list) -> ParseResult:
+        """get_values - overloaded function, from the command line state, get the command to invoke and
+           the command line state to pass on to it
 
            Args:
             cmdl {list} -- cmdl state
 
         """
-
-        cur_state = []
-        cmd_names = self.get_command_names()
-        for index in range(0, len(cmdl)):
-            if cmdl[index] in cmd_names:
-                cur_state = cmdl[:index]
-                self.invoke = cmdl[index]
-                self.cmdl = cmdl[index:]
-                break
-        if '--help' in cur_state or (len(cur_state) == 0 and all('--help' in c for c in self.cmdl)):
-            self._print_help()
-        if not self.invoke:
-            cur_state = self.cmdl
-        if hasattr(self, 'params') and hasattr(self.params, 'order'):
-            while len(cur_state) < len(self.params.order):
-                cur_state.append('')
-            for index in range(0, len(self.params.order)):
-                if isinstance(self.params.order[index], Arg):
-                    if cur_state[index].startswith('-'):
-                        msg = f'An {"opt"!r} was found: {cur_state[index]!r}, '
-                        msg += f'instead of type {"arg"!r}. Order of cmd parameters might be incorrect.'
-                        trace(msg, AssertionError, color='red')
-                    if cur_state[index]:
-                        self.values.append(self.params.order[index].type(cur_state[index]))
-                if isinstance(self.params.order[index], Opt):
-                    values = []
-                    for cmdl_index in range(0, len(cmdl)):
-                        if cmdl[cmdl_index] == self.params.order[index].name or \
-                                cmdl[cmdl_index] == self.params.order[index].short_name:
-                            if len(cmdl) >= cmdl_index + 1 and cmdl[cmdl_index + 1]:
-                                values.append(self.params.order[index].type(cmdl[cmdl_index + 1]))
-
-                    if self.params.order[index].required and not values:
-                        msg = f'{self.params.order[index].name!r} is required'
-                        trace(msg, AssertionError, color='red')
-
-                    if len(values) > 0:
-                        if self.params.order[index].multiple:
-                            self.values.append(values)
-                        else:
-                            self.values.append(values[0])
-                    elif self.params.order[index].default is None:
-                        self.values.append(self.params.order[index].default)
-                    elif self.params.order[index].default:
-                        self.values.append(self.params.order[index].type(self.params.order[index].default))
-                if isinstance(self.params.order[index], Flg):
-                    matches = re.findall(self.regex_patterns[index], ' '.join(cur_state))
-                    self.values.append(True) if matches else self.values.append(False)
+        if not cmdl:
+            self._print_help(1)
+        values, index = self.params.parse(cmdl, self.get_command, self._print_help)
+        if index < len(cmdl):
+            return ParseResult(values, cmdl[index], cmdl[index + 1:])
+        return ParseResult(values)
 
     @classmethod
     def create_new_grp(cls, name: str, fn: Callable, commands: List[Cmd] = None,
-                       params: Params = None, hidden: bool = False):
-        return cls(name, fn, commands=commands, params=params, hidden=hidden)
\ No newline at end of file
+                       params: Params = None, hidden: bool = False, prefix: bool = False):
+        return cls(name, fn, commands=commands, params=params, hidden=hidden, prefix=prefix)
\ No newline at end of file
@@ -0,0 +1,215 @@
+import os
+import sys
+
+from typing import Any, Union
+
+"""
+Daemon mode keeps a built command tree in a server process listening on a Unix domain socket. A client sends its argv,
+working directory, environment and the file descriptors of its stdin, stdout and stderr. The server forks a child for
+every request, the child takes over the client's descriptors, invokes the command tree and sends back the exit code.
+Every request runs in its own process, so the sys.exit of trace and the output of echo only reach the client that made
+the request, and the client reads and writes its own terminal directly.
+
+    python -m cloc.daemon --serve package.module:cli /tmp/cli.sock
+    python -m cloc.daemon /tmp/cli.sock hello-world name
+    python -m cloc.daemon --fallback package.module:cli /tmp/cli.sock hello-world name
+"""
+
+# size of the first read of a request, the header is read until its newline
+_BUFSIZE = 65536
+
+
+def _send_fds(sock: Any, data: bytes, fds: list):
+    import array
+    import socket
+
+    sock.sendmsg([data], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', fds))])
+
+
+def _recv_fds(sock: Any, bufsize: int, maxfds: int) -> tuple:
+    import array
+    import socket
+
+    fds = array.array('i')
+    data, ancdata, _, _ = sock.recvmsg(bufsize, socket.CMSG_LEN(maxfds * fds.itemsize))
+    for level, kind, cmsg_data in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(cmsg_data[:len(cmsg_data) - (len(cmsg_data) % fds.itemsize)])
+    return data, list(fds)
+
+
+def _warm(command: Any):
+    """import every command of a tree given by import path before the server forks, so children start with
+       every module already imported
+    """
+    from cloc.core import Grp, LazyCmd
+
+    if isinstance(command, LazyCmd):
+        command = command.resolve()
+    if isinstance(command, Grp):
+        for c in command.commands:
+            _warm(c)
+
+
+def _handler(command: Any) -> type:
+    import socketserver
+
+    class Handler(socketserver.BaseRequestHandler):
+        """handle one request in a forked child, the child exits once the exit code is sent"""
+
+        def handle(self):
+            import json
+            import signal
+
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            data, fds = _recv_fds(self.request, _BUFSIZE, 3)
+            while not data.endswith(b'\n'):
+                chunk = self.request.recv(_BUFSIZE)
+                if not chunk:
+                    return
+                data += chunk
+            header = json.loads(data)
+
+            os.chdir(header['cwd'])
+            os.environ.clear()
+            os.environ.update(header['env'])
+            for target, fd in enumerate(fds):
+                os.dup2(fd, target)
+                os.close(fd)
+            sys.argv = [header.get('prog', sys.argv[0])] + header['argv']
+
+            exit_code = _invoke(command, header['argv'])
+            self.request.sendall(f'{exit_code}\n'.encode())
+
+    return Handler
+
+
+def _invoke(command: Any, argv: list) -> int:
+    """invoke the command tree with argv and return the exit code, the same as the process would exit with"""
+    exit_code = 0
+    try:
+        command(list(argv))
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            exit_code = e.code or 0
+        else:
+            sys.stderr.write(f'{e.code}\n')
+            exit_code = 1
+    except Exception:
+        import traceback
+
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return exit_code
+
+
+def serve(root: Union[str, Any], path: str, warm: bool = True):
+    """serve - keep a command tree built and serve requests from clients on a Unix domain socket until interrupted
+
+       Args:
+        root {Union[str, Any]} -- import path of the command tree ex: 'package.module:cli', or the command tree
+        path {str} -- file path of the Unix domain socket
+        warm {bool} -- import every command of the tree before serving, otherwise commands given by import path
+            are imported by every request that invokes them
+    """
+    import signal
+    import socket
+    import socketserver
+
+    from cloc.utils import import_path
+
+    command = import_path(root) if isinstance(root, str) else root
+    if warm:
+        _warm(command)
+
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            # a socket file left behind by a server that is no longer running
+            os.unlink(path)
+        else:
+            raise OSError(f'a server is already listening on {path}')
+        finally:
+            probe.close()
+
+    class Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+        pass
+
+    # output of the server must not be copied into the children when they flush their buffers
+    sys.stdout.flush()
+    sys.stderr.flush()
+    # stop and remove the socket file on SIGTERM the same as on an interrupt
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    with Server(path, _handler(command)) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+
+def client(path: str, argv: list = None, fallback: Union[str, Any] = None) -> int:
+    """client - invoke the command tree of a server with this process's argv, working directory, environment, stdin,
+       stdout and stderr and return the exit code of the command
+
+       Args:
+        path {str} -- file path of the Unix domain socket
+        argv {list} -- the command line, defaults to sys.argv[1:]
+        fallback {Union[str, Any]} -- import path of the command tree, or the tree, to invoke in this process when no
+            server is listening on path, otherwise the error of the connect is raised
+    """
+    import json
+    import socket
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    header = {'argv': argv, 'prog': sys.argv[0], 'cwd': os.getcwd(), 'env': dict(os.environ)}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if fallback is None:
+                raise
+            from cloc.utils import import_path
+
+            return _invoke(import_path(fallback) if isinstance(fallback, str) else fallback, argv)
+        _send_fds(sock, (json.dumps(header) + '\n').encode(), [0, 1, 2])
+        reply = b''
+        while not reply.endswith(b'\n'):
+            chunk = sock.recv(64)
+            if not chunk:
+                # the child died before it could send an exit code
+                return 1
+            reply += chunk
+    return int(reply)
+
+
+def main(argv: list = None):
+    """main - python -m cloc.daemon --serve ROOT SOCKET to start a server, python -m cloc.daemon [--fallback ROOT]
+       SOCKET [ARGS...] to invoke the command tree of a server, or ROOT in this process when no server is listening
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    fallback = None
+    if argv[:1] == ['--fallback'] and len(argv) >= 3:
+        fallback, argv = argv[1], argv[2:]
+    if argv[:1] == ['--serve'] and len(argv) == 3 and fallback is None:
+        serve(argv[1], argv[2])
+    elif argv and not argv[0].startswith('-'):
+        try:
+            sys.exit(client(argv[0], argv[1:], fallback))
+        except (FileNotFoundError, ConnectionRefusedError):
+            sys.stderr.write(f'no server is listening on {argv[0]}, start one with --serve or give --fallback ROOT\n')
+            sys.exit(1)
+    else:
+        sys.stderr.write('usage: python -m cloc.daemon --serve ROOT SOCKET | '
+                         'python -m cloc.daemon [--fallback ROOT] SOCKET [ARGS...]\n')
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
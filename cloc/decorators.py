@@ -1,4 +1,3 @@
-import inspect
 from typing import Any
 
 from cloc.core import Arg, Cmd, Grp, Opt, Flg, Params
@@ -21,7 +20,7 @@ class opt(object):
 
     def __call__(self, f):
         if isinstance(f, Params):
-            f.order.insert(0, self.Opt)
+            f.insert(self.Opt)
             return f
         else:
             return Params(fn=f, order=[self.Opt])
@@ -39,7 +38,7 @@ class flg(object):
 
     def __call__(self, f):
         if isinstance(f, Params):
-            f.order.insert(0, self.Flg)
+            f.insert(self.Flg)
             return f
         else:
             return Params(fn=f, order=[self.Flg])
@@ -57,7 +56,7 @@ class arg(object):
 
     def __call__(self, f):
         if isinstance(f, Params):
-            f.order.insert(0, self.Arg)
+            f.insert(self.Arg)
             return f
         else:
             return Params(fn=f, order=[self.Arg])
@@ -68,18 +67,21 @@ class cmd(object):
        Args:
         name {str} -- name to give Cmd
         hidden {bool} -- flag for Cmd to be hidden
+        output {str} -- format to stream an iterator returned by the Cmd in, one of lines, ndjson, csv, json,
+            None returns the iterator
     """
-    def __init__(self, name:str = None, hidden:bool = False):
+    def __init__(self, name:str = None, hidden:bool = False, output: str = None):
         self.name = name
         self.hidden = hidden
+        self.output = output
 
     def __call__(self, f):
         if isinstance(f, Cmd):
             return f
         elif isinstance(f, Params):
-            return Cmd.create_new_cmd(self.name, f.fn, params=f, hidden=self.hidden)
+            return Cmd.create_new_cmd(self.name, f.fn, params=f, hidden=self.hidden, output=self.output)
         else:
-            return Cmd.create_new_cmd(self.name, f, params=Params(fn=f), hidden=self.hidden)
+            return Cmd.create_new_cmd(self.name, f, params=Params(fn=f), hidden=self.hidden, output=self.output)
 
 class grp(object):
     """grp - decorator for creating a new Grp
@@ -87,16 +89,18 @@ class grp(object):
        Args:
         name {str} -- name to give Grp
         hidden {bool} -- flag for Grp to be hidden
+        prefix {bool} -- flag for Grp to invoke commands by an unambiguous prefix of the name
     """
-    def __init__(self, name:str = None, hidden:bool = False):
+    def __init__(self, name:str = None, hidden:bool = False, prefix:bool = False):
         self.name = name
         self.hidden  = hidden
+        self.prefix = prefix
 
     def __call__(self, f):
         if isinstance(f, Grp):
             return f
         elif isinstance(f, Params):
-            return Grp.create_new_grp(self.name, f.fn, params=f, hidden=self.hidden)
+            return Grp.create_new_grp(self.name, f.fn, params=f, hidden=self.hidden, prefix=self.prefix)
         else:
-            return Grp.create_new_grp(self.name, f, params=Params(fn=f), hidden=self.hidden)
+            return Grp.create_new_grp(self.name, f, params=Params(fn=f), hidden=self.hidden, prefix=self.prefix)
 
@@ -0,0 +1,210 @@
+import os
+import sys
+
+from typing import Callable, Union
+
+from cloc.core import BaseCmd, Grp, LazyCmd, Params
+from cloc.utils import import_path
+
+"""
+A snapshot is a json file of a built command tree. Groups marked with noop are saved with their commands,
+every other command is saved by the import path to the object, so loading a snapshot imports no user modules and
+dispatch only imports the module of the command that was invoked.
+
+The snapshot is out of date once any module a command was saved from changes on disk.
+"""
+
+SNAPSHOT_VERSION = 1
+
+
+def noop(fn: Callable) -> Callable:
+    """noop - mark the function of a Grp as doing nothing when invoked, so a snapshot saves the Grp with its commands
+       instead of by its import path
+
+        @grp('cli')
+        @noop
+        def cli():
+            pass
+
+       Args:
+        fn {Callable} -- the function of the Grp
+    """
+    fn.__cloc_noop__ = True
+    return fn
+
+
+@noop
+def _noop():
+    pass
+
+
+def _is_noop(grp: Grp) -> bool:
+    """a Grp can be rebuilt from a snapshot if it has no params and its function is marked with noop"""
+    return getattr(grp.fn, '__cloc_noop__', False) is True and not (grp.params and grp.params.order)
+
+
+def _source(module_name: str) -> Union[str, None]:
+    """file of a module, a module that is not imported yet, ex: of a LazyCmd, is found without importing it"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return getattr(module, '__file__', None)
+    import importlib.util
+
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    return spec.origin if spec is not None and spec.has_location else None
+
+
+def _find_instance(instance: object, modules: list) -> Union[str, None]:
+    """find the module level name an instance was assigned to"""
+    for module_name in modules:
+        module = sys.modules.get(module_name)
+        for name, value in vars(module).items() if module else ():
+            if value is instance:
+                return f'{module_name}:{name}'
+    return None
+
+
+def _reference(command: BaseCmd, modules: list) -> Union[str, None]:
+    """import path of a command, None if the command can not be imported by another process"""
+    if isinstance(command, LazyCmd):
+        return command.path
+    fn = getattr(command, 'fn', None)
+    module = getattr(fn, '__module__', None)
+    if not module or module == '__main__' or '<locals>' in getattr(fn, '__qualname__', '<locals>'):
+        return None
+    dataclass = getattr(command, 'dataclass', None)
+    if dataclass is not None:
+        owner = _find_instance(dataclass, modules + [type(dataclass).__module__])
+        path = f'{owner}.{fn.__name__}' if owner else None
+    else:
+        path = f'{module}:{fn.__qualname__}'
+    try:
+        resolved = LazyCmd(command.name, path).resolve() if path else None
+    except (ImportError, AttributeError):
+        return None
+    if resolved is command or (dataclass is not None and getattr(resolved, 'dataclass', None) is dataclass and
+                               getattr(resolved, 'fn', None) is fn):
+        return path
+    return None
+
+
+def _save(command: BaseCmd, modules: list, sources: set) -> Union[dict, None]:
+    """save a command to a dict, None if it can not be saved"""
+    node = {'name': command.name, 'doc': command.__doc__, 'hidden': command.hidden}
+    if isinstance(command, Grp) and _is_noop(command):
+        module = getattr(command.fn, '__module__', None)
+        commands = []
+        for c in command.commands:
+            saved = _save(c, modules + [module], sources)
+            if saved is None:
+                commands = None
+                break
+            commands.append(saved)
+        if commands is not None:
+            node.update(prefix=command.prefix, commands=commands)
+            return node
+    path = _reference(command, modules)
+    if path is None:
+        return None
+    sources.add(path.partition(':')[0])
+    sources.add(getattr(getattr(command, 'fn', None), '__module__', None) or path.partition(':')[0])
+    node['path'] = path
+    return node
+
+
+def _load(node: dict) -> BaseCmd:
+    """rebuild a command from a saved dict"""
+    if 'path' in node:
+        return LazyCmd(node['name'], node['path'], node['doc'], node['hidden'])
+    grp = Grp(node['name'], _noop, params=Params(fn=_noop), hidden=node['hidden'], prefix=node['prefix'])
+    grp.doc = node['doc']
+    for command in node['commands']:
+        grp.add_command(_load(command))
+    return grp
+
+
+def _stat(filepath: str) -> list:
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def dump(command: Grp, path: str, root: str) -> bool:
+    """dump - save a snapshot of a built command tree
+
+       Args:
+        command {Grp} -- the built command tree
+        path {str} -- file to save the snapshot to
+        root {str} -- import path of the command tree ex: 'package.module:cli'
+
+    returns True if the snapshot was saved, False if the tree could not be saved
+    """
+    import json
+
+    module = root.partition(':')[0]
+    sources = {module}
+    node = _save(command, [module], sources)
+    if node is None:
+        return False
+    if 'path' in node:
+        node['path'] = root
+    files = {}
+    for source in sources:
+        filepath = _source(source)
+        if filepath is None:
+            return False
+        files[filepath] = _stat(filepath)
+    snapshot = {'version': SNAPSHOT_VERSION, 'python': list(sys.version_info[:2]), 'root': root,
+                'sources': files, 'command': node}
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as fout:
+        json.dump(snapshot, fout, separators=(',', ':'))
+    os.replace(tmp, path)
+    return True
+
+
+def load(path: str, root: str = None) -> Union[BaseCmd, None]:
+    """load - load a command tree from a snapshot
+
+       Args:
+        path {str} -- file the snapshot was saved to
+        root {str} -- if given, the snapshot must have been saved for this import path
+
+    returns the command tree or None if there is no snapshot or it is out of date
+    """
+    import json
+
+    try:
+        with open(path) as fin:
+            snapshot = json.load(fin)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('python') != list(sys.version_info[:2]):
+        return None
+    if root is not None and snapshot.get('root') != root:
+        return None
+    for filepath, stat in snapshot['sources'].items():
+        if _stat(filepath) != stat:
+            return None
+    return _load(snapshot['command'])
+
+
+def cached(path: str, root: str) -> BaseCmd:
+    """cached - load the command tree from a snapshot, if the snapshot is missing or out of date import the tree from
+       root and save a new snapshot
+
+       Args:
+        path {str} -- file for the snapshot
+        root {str} -- import path of the command tree ex: 'package.module:cli'
+    """
+    command = load(path, root)
+    if command is None:
+        command = import_path(root)
+        if isinstance(command, Grp):
+            dump(command, path, root)
+    return command
@@ -0,0 +1,264 @@
+import sys
+import time
+
+from typing import Any, AsyncIterable, Iterable, Iterator, Union
+
+"""
+Streams parse json as it is read and write the records of a command as they are made, so a large body or result set
+never has to be held in memory at once.
+
+Formats for writing records:
+    lines -- one record per line as str
+    ndjson -- one record per line as json
+    csv -- one record per row, the keys of the first dict record are the header
+    json -- one json array of every record
+"""
+
+OUTPUT_FORMATS = ('lines', 'ndjson', 'csv', 'json')
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+_NUMBER_START = '-0123456789'
+
+
+def iter_json_array(chunks: Iterable[Union[bytes, str]]) -> Iterator[Any]:
+    """iter_json_array - yield the items of a top level json array as the chunks of it are read
+
+       Args:
+        chunks {Iterable[Union[bytes, str]]} -- the json array in chunks of any size, bytes are decoded as utf-8
+
+        raises ValueError if the json is not an array or is not valid, data after the array is only found once every
+        chunk is read
+    """
+    import codecs
+    import json
+
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer, position, started, ended, final = '', 0, False, False, False
+    # after an item a ',' or ']' must come next, after a ',' an item must come next
+    after_item, after_comma = False, False
+    # an item that is not complete is only parsed again once the buffer is this long, so a large item is not
+    # parsed from the start for every chunk
+    retry_at = 0
+    while not final:
+        chunk = next(chunks, None)
+        final = chunk is None
+        if not final:
+            buffer += utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if len(buffer) < retry_at:
+                continue
+        else:
+            buffer += utf8.decode(b'', True)
+
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                retry_at = 0
+                break
+            if ended:
+                raise ValueError('extra data after the json array')
+            if not started:
+                if buffer[position] != '[':
+                    raise ValueError(f'expected a json array, found {buffer[position]!r}')
+                started = True
+                position += 1
+            elif buffer[position] == ']' and not after_comma:
+                ended = True
+                position += 1
+            elif buffer[position] == ',' and after_item:
+                after_item, after_comma = False, True
+                position += 1
+            elif after_item:
+                raise ValueError(f'expected \',\' or \']\' in the json array, found {buffer[position]!r}')
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    retry_at = 2 * (len(buffer) - position)
+                    break
+                if not final and (end == len(buffer) or (buffer[position] in _NUMBER_START and
+                                                          buffer[end] not in _DELIMITERS)):
+                    # a number or literal may continue in the next chunk, ex: '12345.' then '678', it is only
+                    # complete once a delimiter follows it
+                    retry_at = 0
+                    break
+                yield item
+                position = end
+                after_item, after_comma = True, False
+
+        # drop what has been parsed
+        buffer, position = buffer[position:], 0
+    if not ended:
+        raise ValueError('the json array is not complete')
+
+
+class _Parts(list):
+    """a list csv.writer can write to"""
+    write = list.append
+
+
+class RecordWriter(object):
+    """RecordWriter - write records one at a time in an output format, written records are joined and written to the
+       stream every flush_every records or flush_interval seconds, so memory stays flat however many records there are
+       and a slow reader of a pipe holds back the records instead of them piling up
+
+       Args:
+        format {str} -- one of lines, ndjson, csv, json
+        stream {Any} -- text stream to write to, stdout by default
+        flush_every {int} -- most records held before they are written
+        flush_interval {float} -- most seconds records are held before they are written
+    """
+    __slots__ = ('format', 'stream', 'flush_every', 'flush_interval', 'count', '_parts', '_pending', '_flushed',
+                 '_emit', '_end')
+
+    def __init__(self, format: str = 'lines', stream: Any = None, flush_every: int = 1000,
+                 flush_interval: float = 0.5):
+        if format not in OUTPUT_FORMATS:
+            raise ValueError(f'format must be one of {", ".join(OUTPUT_FORMATS)}, got {format!r}')
+        self.format = format
+        self.stream = stream or sys.stdout
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._parts = _Parts()
+        self._pending = 0
+        self._flushed = time.monotonic()
+        self._end = ''
+        self._emit = getattr(self, f'_{format}')()
+
+    def write(self, record: Any):
+        """write - add a record to the output"""
+        self._emit(record)
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.flush_every or time.monotonic() - self._flushed >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """flush - write the records held to the stream"""
+        if self._parts:
+            self.stream.write(''.join(self._parts))
+            self._parts.clear()
+        self.stream.flush()
+        self._pending = 0
+        self._flushed = time.monotonic()
+
+    def close(self):
+        """close - end the output, ex: the ']' of a json array, and flush"""
+        self._parts.append(self._end)
+        self._end = ''
+        self.flush()
+
+    def _lines(self):
+        parts = self._parts
+
+        def emit(record: Any):
+            parts.append(record if isinstance(record, str) else str(record))
+            parts.append('\n')
+        return emit
+
+    def _ndjson(self):
+        import json
+
+        parts = self._parts
+        encode = json.JSONEncoder(separators=(',', ':'), default=str).encode
+
+        def emit(record: Any):
+            parts.append(encode(record))
+            parts.append('\n')
+        return emit
+
+    def _json(self):
+        import json
+
+        parts = self._parts
+        encode = json.JSONEncoder(separators=(',', ':'), default=str).encode
+        # the array is only opened by the first record so no records write []
+        self._end = '[]\n'
+        separator = '[\n'
+
+        def emit(record: Any):
+            nonlocal separator
+            if separator == '[\n':
+                self._end = '\n]\n'
+            parts.append(separator)
+            separator = ',\n'
+            parts.append(encode(record))
+        return emit
+
+    def _csv(self):
+        import csv
+
+        writer = csv.writer(self._parts, lineterminator='\n')
+        fields = []
+
+        def emit(record: Any):
+            if isinstance(record, dict):
+                if not fields:
+                    fields.extend(record)
+                    writer.writerow(fields)
+                writer.writerow([record.get(field, '') for field in fields])
+            elif isinstance(record, (str, bytes)) or not isinstance(record, Iterable):
+                writer.writerow([record])
+            else:
+                writer.writerow(record)
+        return emit
+
+
+def write_records(records: Iterable[Any], format: str = 'lines', stream: Any = None, flush_every: int = 1000,
+                  flush_interval: float = 0.5) -> int:
+    """write_records - write records as they are read from an iterable and return the number written
+
+       Args:
+        records {Iterable[Any]} -- records, read lazily
+        format {str} -- one of lines, ndjson, csv, json
+        stream {Any} -- text stream to write to, stdout by default
+        flush_every {int} -- most records held before they are written
+        flush_interval {float} -- most seconds records are held before they are written
+    """
+    writer = RecordWriter(format, stream, flush_every, flush_interval)
+    try:
+        for record in records:
+            writer.write(record)
+    except BrokenPipeError:
+        # nothing reads the stream anymore, stop making records
+        if hasattr(records, 'close'):
+            records.close()
+        raise
+    except BaseException:
+        # the records made before the error are still written
+        writer.flush()
+        raise
+    writer.close()
+    return writer.count
+
+
+async def awrite_records(records: AsyncIterable[Any], format: str = 'lines', stream: Any = None,
+                         flush_every: int = 1000, flush_interval: float = 0.5) -> int:
+    """awrite_records - write records as they are read from an async iterable and return the number written
+
+       Args:
+        records {AsyncIterable[Any]} -- records, read lazily
+        format {str} -- one of lines, ndjson, csv, json
+        stream {Any} -- text stream to write to, stdout by default
+        flush_every {int} -- most records held before they are written
+        flush_interval {float} -- most seconds records are held before they are written
+    """
+    writer = RecordWriter(format, stream, flush_every, flush_interval)
+    try:
+        async for record in records:
+            writer.write(record)
+    except BrokenPipeError:
+        if hasattr(records, 'aclose'):
+            await records.aclose()
+        raise
+    except BaseException:
+        writer.flush()
+        raise
+    writer.close()
+    return writer.count
@@ -1,20 +1,31 @@
 import os
 import re
-import json
 import io
+import functools
 
-from datetime import datetime
-from typing import Any, Union
+from typing import Any, Iterable, Iterator, Union
 from cloc.utils import trace
 
-"""
-Types still to make:
-    hashtypes - md5, sha1
-"""
-
 SHA256_PATTERN = re.compile('[A-Fa-f0-9]{64}')
+SHA256_BYTES_PATTERN = re.compile(rb'[A-Fa-f0-9]{64}')
+HEX_BYTES = b'0123456789abcdefABCDEF'
 URL_PATTERN = re.compile('(http|ftp|https)://([\w_-]+(?:(?:\.[\w_-]+)+))([\w.,@?^=%&:/~+#-]*[\w@?^=%&/~+#-])?')
 
+
+def _memoized(call: Any) -> Any:
+    """wrap the __call__ of a type so a memoized instance converts each str value once. Only the __call__ of the
+       type of the instance is memoized, a super().__call__ inside it is not
+    """
+    @functools.wraps(call)
+    def __call__(self, value: str):
+        memo = self._memo
+        if memo is not None and type(self).__call__ is __call__ and isinstance(value, str) and \
+                self._memoizable(value):
+            return memo(value)
+        return call(self, value)
+    return __call__
+
+
 class BaseType(object):
     """BaseType - BaseType object for creating new Param types
 
@@ -22,10 +33,17 @@ class BaseType(object):
     """
     __name__ = 'cloc.BaseType'
     basetype: Any
+    # conversions are only memoized once memoize is called
+    _memo = None
 
     def __init__(self, basetype: Any= None):
         self.basetype = basetype or str
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if '__call__' in cls.__dict__:
+            cls.__call__ = _memoized(cls.__call__)
+
     def __call__(self, value: str):
         """overload __call__ for converting to new type
 
@@ -34,6 +52,38 @@ class BaseType(object):
         """
         return self.basetype(value)
 
+    def memoize(self, maxsize: int = 1024) -> 'BaseType':
+        """memoize - remember the conversions of the last maxsize str values, so a value that repeats is converted
+           once. Converted values are shared between conversions and should not be changed. 0 stops memoizing
+
+        Args:
+            maxsize {int} -- most values to remember
+
+        returns the type so it can be memoized where it is given to a param
+        """
+        self._memo = functools.lru_cache(maxsize)(functools.partial(type(self).__call__.__wrapped__, self)) \
+            if maxsize else None
+        return self
+
+    def memo_stats(self) -> Union[dict, None]:
+        """memo_stats - hits, misses, maxsize and currsize of the memo, None if the type is not memoized"""
+        return self._memo.cache_info()._asdict() if self._memo is not None else None
+
+    def _memoizable(self, value: str) -> bool:
+        """overload to keep values whose conversion has side effects or reads a file from being memoized"""
+        return True
+
+    def convert_many(self, values: list) -> Any:
+        """convert_many - convert every value of a multiple Opt at once, overload to convert in bulk
+
+        Args:
+            values {list} -- values to convert
+        """
+        return [self(value) for value in values]
+
+
+BaseType.__call__ = _memoized(BaseType.__call__)
+
 class Choices(BaseType):
     __name__ = 'cloc.Choices'
 
@@ -43,27 +93,191 @@ class Choices(BaseType):
 
     def __call__(self, value: str):
         if value not in self.choices:
-            trace(f'Error: {value!r} was not found in choices: {", ".join(self.choices)!r}',  TypeError)
+            trace(f'Error: {value!r} was not found in choices: {", ".join(self.choices)!r}', TypeError,
+                  exit_code=1)
         return value
 
 class FileType(BaseType):
-    __name__ = 'cloc.File'
+    """FileType - convert a file path, or - for stdin, into an open file. Nothing is kept on the type, so one
+       instance can open any number of files
 
-    def __init__(self):
-        super().__init__(io.TextIOWrapper)
+        Args:
+            mode {str} -- text (default) a text file object, binary a binary file object, mmap a read only
+                memory map of the file, chunks an iterator of bytes chunk_size long that closes the file once read
+            chunk_size {int} -- size of the chunks for the chunks mode
+            encoding {str} -- encoding of the text mode, defaults to the locale encoding
+    """
+    __name__ = 'cloc.File'
+    MODES = ('text', 'binary', 'mmap', 'chunks')
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.fobj.close()
+    def __init__(self, mode: str = 'text', chunk_size: int = 1024 * 1024, encoding: str = None):
+        if mode not in self.MODES:
+            raise ValueError(f'mode must be one of {", ".join(self.MODES)}, got {mode!r}')
+        super().__init__(io.TextIOWrapper if mode == 'text' else io.BufferedReader)
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.encoding = encoding
 
     def __call__(self, filepath: str):
+        if filepath == '-':
+            return self._stdin()
         if not os.path.exists(filepath):
-            trace(f'Error: {filepath!r} does not  exists', TypeError)
+            trace(f'Error: {filepath!r} does not  exists', TypeError, exit_code=1)
         elif not os.path.isfile(filepath):
-            trace(f'Error: {filepath!r} is not a file', TypeError)
-        self.fobj = open(filepath, 'r')
-        return self.fobj
+            trace(f'Error: {filepath!r} is not a file', TypeError, exit_code=1)
+        if self.mode == 'text':
+            return open(filepath, 'r', encoding=self.encoding)
+        fobj = open(filepath, 'rb')
+        if self.mode == 'binary':
+            return fobj
+        if self.mode == 'chunks':
+            return self._chunks(fobj)
+        with fobj:
+            return self._mmap(fobj.fileno())
+
+    def _memoizable(self, value: str) -> bool:
+        # every conversion opens a file
+        return False
+
+    def _stdin(self):
+        import sys
+
+        if self.mode == 'text':
+            return sys.stdin
+        if self.mode == 'binary':
+            return sys.stdin.buffer
+        if self.mode == 'chunks':
+            return self._chunks(sys.stdin.buffer, close=False)
+        import stat
+
+        # stdin can only be mapped when it is redirected from a file
+        if not stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode):
+            trace('Error: stdin is not a file and can not be memory mapped', TypeError, exit_code=1)
+        return self._mmap(sys.stdin.fileno())
+
+    def _chunks(self, fobj: Any, close: bool = True):
+        try:
+            for chunk in iter(lambda: fobj.read(self.chunk_size), b''):
+                yield chunk
+        finally:
+            if close:
+                fobj.close()
+
+    @staticmethod
+    def _mmap(fileno: int):
+        import mmap
+
+        if os.fstat(fileno).st_size == 0:
+            # an empty file can not be mapped
+            return b''
+        mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        return mapped
+
+class MultiRange(object):
+    """MultiRange - a lazy sequence of ints made of one or more ranges, nothing is materialized until asked for.
+       len, int index and membership never iterate the values, a slice is another MultiRange
+
+        Args:
+            ranges {range} -- the ranges in order
+    """
+    __slots__ = ('ranges', '_offsets')
+
+    def __init__(self, *ranges: range):
+        self.ranges = tuple(r for r in ranges if len(r))
+        self._offsets = []
+        total = 0
+        for r in self.ranges:
+            self._offsets.append(total)
+            total += len(r)
+        self._offsets.append(total)
+
+    def __len__(self) -> int:
+        return self._offsets[-1]
+
+    def __iter__(self) -> Iterator[int]:
+        for r in self.ranges:
+            yield from r
+
+    def __reversed__(self) -> Iterator[int]:
+        for r in reversed(self.ranges):
+            yield from reversed(r)
+
+    def __contains__(self, value: Any) -> bool:
+        return any(value in r for r in self.ranges)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, 'MultiRange']:
+        if isinstance(index, slice):
+            positions = range(len(self))[index]
+            if positions.step > 0:
+                return MultiRange(*self._slice(self.ranges, self._offsets, positions))
+            # a negative step is a positive step over the reversed ranges
+            last = len(self) - 1
+            ranges = tuple(r[::-1] for r in reversed(self.ranges))
+            offsets = [len(self) - offset for offset in reversed(self._offsets)]
+            positions = range(last - positions.start, last - positions.stop, -positions.step)
+            return MultiRange(*self._slice(ranges, offsets, positions))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('MultiRange index out of range')
+        from bisect import bisect_right
+
+        segment = bisect_right(self._offsets, index) - 1
+        return self.ranges[segment][index - self._offsets[segment]]
+
+    @staticmethod
+    def _slice(ranges: tuple, offsets: list, positions: range) -> Iterator[range]:
+        """the part of each range at the positions of a range with a positive step"""
+        step = positions.step
+        for r, offset in zip(ranges, offsets):
+            # first and last index into positions that fall in this range, by ceiling division
+            lo = max(0, -(-(offset - positions.start) // step))
+            hi = min(len(positions), -(-(offset + len(r) - positions.start) // step))
+            if lo < hi:
+                yield r[positions[lo] - offset:positions[hi - 1] - offset + 1:step]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, MultiRange):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'MultiRange({", ".join(map(repr, self.ranges))})'
+
+    def tolist(self) -> list:
+        """tolist - materialize the values into a list"""
+        return list(self)
+
+    def array(self, typecode: str = 'q') -> 'array.array':
+        """array - materialize the values into an array.array of typecode"""
+        from array import array
+
+        values = array(typecode)
+        for r in self.ranges:
+            values.extend(r)
+        return values
+
+    def numpy(self, dtype: Any = 'int64') -> 'numpy.ndarray':
+        """numpy - materialize the values into a numpy array, numpy must be installed"""
+        import numpy
+
+        if not self.ranges:
+            return numpy.empty(0, dtype=dtype)
+        return numpy.concatenate([numpy.arange(r.start, r.stop, r.step, dtype=dtype) for r in self.ranges])
+
+
+INT_SEGMENT_PATTERN = re.compile(r'(-?\d+)-(-?\d+)')
+
 
 class IntRangeType(BaseType):
+    """IntRangeType - convert input into a lazy MultiRange
+
+        n -- 0 up to n
+        start,stop[,step] -- the same as range(start, stop, step)
+        1-5,10-20,30 -- inclusive segments and single values
+    """
     __name__ = 'cloc.IntRange'
     basetype: int
 
@@ -73,55 +287,283 @@ class IntRangeType(BaseType):
     def __call__(self, value: Union[str, int]):
         if isinstance(value, str):
             vals = value.split(',')
-            if len(vals) == 1:
-                return list(range(int(vals[0])))
-            elif len(vals) == 2:
-                return list(range(int(vals[0]), int(vals[1])))
-            else:
-                trace(f'Unable to find a start or stop value based on given: {value!r}', TypeError)
+            try:
+                if any(INT_SEGMENT_PATTERN.fullmatch(v.strip()) for v in vals):
+                    return MultiRange(*map(self._segment, vals))
+                if 1 <= len(vals) <= 3:
+                    return MultiRange(range(*map(int, vals)) if len(vals) > 1 else range(int(vals[0])))
+            except ValueError:
+                pass
+            trace(f'Unable to find a start or stop value based on given: {value!r}', TypeError, exit_code=1)
         elif isinstance(value, int):
-            return list(range(value))
+            return MultiRange(range(value))
         else:
-            trace(f'{value!r} was {type(value).__name__!r} and not {"str"!r} or {"int"!r}', TypeError)
+            trace(f'{value!r} was {type(value).__name__!r} and not {"str"!r} or {"int"!r}', TypeError, exit_code=1)
+
+    @staticmethod
+    def _segment(value: str) -> range:
+        match = INT_SEGMENT_PATTERN.fullmatch(value.strip())
+        if match is None:
+            return range(int(value), int(value) + 1)
+        start, stop = int(match.group(1)), int(match.group(2))
+        return range(start, stop + 1) if start <= stop else range(start, stop - 1, -1)
 
 class DateType(BaseType):
+    """DateType - convert input into a datetime. ISO 8601 is parsed by datetime.fromisoformat in C, so only values in
+       other formats pay for strptime. Parsers are tried in the order of the args
+
+        Args:
+            formats {tuple} -- strptime formats tried after ISO 8601, defaults to FORMATS
+            iso {bool} -- parse ISO 8601 with datetime.fromisoformat
+            epoch {bool} -- parse seconds since the epoch into a UTC datetime
+    """
     __name__ = 'cloc.Date'
-    basetype: datetime
+    basetype: 'datetime'
+    FORMATS = ('%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S')
 
-    def __init__(self):
+    def __init__(self, formats: tuple = None, iso: bool = True, epoch: bool = False):
+        from datetime import datetime
         super().__init__(datetime)
+        self.formats = tuple(self.FORMATS if formats is None else formats)
+        self._parsers = ([datetime.fromisoformat] if iso else []) + \
+            [lambda value, f=f: datetime.strptime(value, f) for f in self.formats] + ([self._epoch] if epoch else [])
+        if not self._parsers:
+            raise ValueError('DateType needs at least one of formats, iso or epoch')
+        self._names = (['ISO 8601'] if iso else []) + list(self.formats) + (['epoch seconds'] if epoch else [])
 
     def __call__(self, value: str):
-        patterns = ('%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S')
-        for p in patterns:
+        if isinstance(value, self.basetype):
+            return value
+        # always in priority order, a value more than one parser accepts must not depend on the values before it
+        for parser in self._parsers:
             try:
-                return datetime.strptime(value, p)
-            except:
-                pass
-        trace(f'{value!r} was {type(value).__name__!r} and not {"str"!r} or {"int"!r}', TypeError)
+                return parser(value)
+            except (ValueError, TypeError, OverflowError, OSError):
+                continue
+        trace(f'{value!r} is not a date in any of the formats: {", ".join(self._names)}', TypeError, exit_code=1)
+
+    @staticmethod
+    def _epoch(value: Union[str, int, float]) -> 'datetime':
+        from datetime import datetime, timezone
+
+        return datetime.fromtimestamp(float(value), timezone.utc)
+
+    def convert_many(self, values: Iterable[str], numpy: bool = False) -> Union[list, 'numpy.ndarray']:
+        """convert_many - convert many values into a list of datetime, or a numpy datetime64 array in UTC
+
+            Args:
+                values {Iterable[str]} -- values to convert
+                numpy {bool} -- return a numpy datetime64[us] array, numpy must be installed
+        """
+        dates = [self(value) for value in values]
+        if not numpy:
+            return dates
+        import numpy as np
+        from datetime import timezone
+
+        # numpy only takes naive datetimes, aware datetimes are converted to UTC first
+        return np.array([d.astimezone(timezone.utc).replace(tzinfo=None) if d.tzinfo else d for d in dates],
+                        dtype='datetime64[us]')
+
+def _scan_sha256(chunks: Iterable[bytes]) -> Iterator[str]:
+    """yield every sha256 found in chunks of bytes, the same as SHA256_PATTERN.findall over the whole text. A run of
+       hex that reaches the end of a chunk is carried into the next chunk, blocks of 64 are counted from the start
+       of a run so only the part of the run that is not yet a full block has to be carried
+    """
+    carry = b''
+    for chunk in chunks:
+        buffer = carry + chunk if carry else chunk
+        tail = len(buffer) - len(buffer.rstrip(HEX_BYTES))
+        cut = len(buffer) - tail
+        # latin-1 decodes any bytes, findall on str is faster than making a str of every bytes match
+        yield from SHA256_PATTERN.findall(buffer[:cut].decode('latin-1'))
+        blocks = cut + tail - tail % 64
+        for start in range(cut, blocks, 64):
+            yield buffer[start:start + 64].decode()
+        carry = buffer[blocks:]
+
+
+def _read_chunks(fin: Any, chunk_size: int, length: int = None) -> Iterator[bytes]:
+    while length is None or length > 0:
+        chunk = fin.read(chunk_size if length is None else min(chunk_size, length))
+        if not chunk:
+            return
+        if length is not None:
+            length -= len(chunk)
+        yield chunk
+
+
+def _scan_sha256_file(filepath: str, chunk_size: int, start: int = 0, end: int = None) -> Iterator[str]:
+    with open(filepath, 'rb') as fin:
+        fin.seek(start)
+        yield from _scan_sha256(_read_chunks(fin, chunk_size, None if end is None else end - start))
+
+
+def _scan_sha256_segment(filepath: str, chunk_size: int, start: int, end: int) -> str:
+    # one str is sent back to the parent instead of a list of every sha256
+    return ' '.join(_scan_sha256_file(filepath, chunk_size, start, end))
+
+
+def _hex_run_segments(filepath: str, count: int) -> list:
+    """split a file into count (start, end) segments that only start and end where a run of hex ends, so every
+       sha256 is found in exactly one segment
+    """
+    size = os.path.getsize(filepath)
+    bounds = [0]
+    with open(filepath, 'rb') as fin:
+        for i in range(1, count):
+            position = max(size * i // count, bounds[-1])
+            fin.seek(position)
+            for block in iter(lambda: fin.read(4096), b''):
+                run = len(block) - len(block.lstrip(HEX_BYTES))
+                position += run
+                if run < len(block):
+                    break
+            bounds.append(min(position, size))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def _unique(values: Iterable[str]) -> Iterator[str]:
+    seen = set()
+    for value in values:
+        if value not in seen:
+            seen.add(value)
+            yield value
+
 
 class Sha256Type(BaseType):
+    """Sha256Type - convert a sha256, or a file path (- for stdin) into every sha256 found in the file. Files are
+       scanned in chunks so a file of any size can be scanned
+
+        Args:
+            lazy {bool} -- return an iterator that scans while it is read instead of a list
+            dedup {bool} -- only return the first of each sha256 found
+            workers {int} -- scan a file in this many segments in parallel processes
+            mmap {bool} -- scan a memory map of the file instead of reading chunks
+            chunk_size {int} -- bytes read at a time
+    """
     __name__ = 'cloc.Sha256'
     basetype: str
 
-    def __init__(self):
+    def __init__(self, lazy: bool = False, dedup: bool = False, workers: int = 1, mmap: bool = False,
+                 chunk_size: int = 1024 * 1024):
         super().__init__(str)
+        self.lazy = lazy
+        self.dedup = dedup
+        self.workers = workers
+        self.mmap = mmap
+        self.chunk_size = chunk_size
 
     def __call__(self, value: str):
         if value and isinstance(value, str):
-            if os.path.exists(value):
+            if value == '-':
+                import sys
+
+                hashes = _scan_sha256(_read_chunks(sys.stdin.buffer, self.chunk_size))
+            elif os.path.exists(value):
                 if os.path.isfile(value):
-                    with open(value, 'r') as fin:
-                        return SHA256_PATTERN.findall(fin.read())
+                    hashes = self._scan(value)
                 else:
-                    trace(f'expected path to be a file, got {value!r}, {type(value).__name__!r}', TypeError)
+                    trace(f'expected path to be a file, got {value!r}, {type(value).__name__!r}', TypeError,
+                          exit_code=1)
             else:
                 if SHA256_PATTERN.match(value):
                     return value
                 else:
-                    trace(f'{value!r} is not a valid sha256', TypeError)
+                    trace(f'{value!r} is not a valid sha256', TypeError, exit_code=1)
+            if self.dedup:
+                hashes = _unique(hashes)
+            return hashes if self.lazy else list(hashes)
         else:
-            trace(f'expected string for sha256 type conversion, got {value!r} of type {type(value).__name__}')
+            trace(f'expected string for sha256 type conversion, got {value!r} of type {type(value).__name__}',
+                  TypeError, exit_code=1)
+
+    def _memoizable(self, value: str) -> bool:
+        # a file may change between conversions and a lazy scan can only be read once
+        return not self.lazy and value != '-' and not os.path.exists(value)
+
+    def _scan(self, filepath: str) -> Iterator[str]:
+        if self.workers > 1 and os.path.getsize(filepath) > self.chunk_size:
+            return self._scan_parallel(filepath)
+        if self.mmap:
+            return self._scan_mmap(filepath)
+        return _scan_sha256_file(filepath, self.chunk_size)
+
+    def _scan_mmap(self, filepath: str) -> Iterator[str]:
+        with open(filepath, 'rb') as fin:
+            mapped = FileType._mmap(fin.fileno())
+        try:
+            for match in SHA256_BYTES_PATTERN.finditer(mapped):
+                yield match.group().decode()
+        finally:
+            if mapped:
+                mapped.close()
+
+    def _scan_parallel(self, filepath: str) -> Iterator[str]:
+        """scan segments of the file in worker processes, the hashes of each segment are yielded in file order"""
+        from concurrent.futures import ProcessPoolExecutor
+
+        segments = _hex_run_segments(filepath, self.workers)
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(segments))) as executor:
+            futures = [executor.submit(_scan_sha256_segment, filepath, self.chunk_size, start, end)
+                       for start, end in segments]
+            for future in futures:
+                yield from future.result().split()
+
+
+class DigestType(BaseType):
+    """DigestType - convert a file path (- for stdin) into the hex digest of the file, read in large buffers so a file
+       of any size is hashed with bounded memory. A value that is already a hex digest of the algorithm is returned
+
+        Args:
+            algorithm {str} -- any algorithm of hashlib ex: md5, sha1, sha256
+            buffer_size {int} -- bytes read at a time
+    """
+    basetype: str
+
+    def __init__(self, algorithm: str = 'sha256', buffer_size: int = 1024 * 1024):
+        import hashlib
+
+        super().__init__(str)
+        self.algorithm = algorithm
+        self.buffer_size = buffer_size
+        self.__name__ = f'cloc.{algorithm.title()}'
+        self._pattern = re.compile(f'[A-Fa-f0-9]{{{hashlib.new(algorithm).digest_size * 2}}}')
+
+    def __call__(self, value: str):
+        if not value or not isinstance(value, str):
+            trace(f'expected string for {self.algorithm} type conversion, got {value!r} of type '
+                  f'{type(value).__name__}', TypeError, exit_code=1)
+        if value == '-':
+            import sys
+
+            return self.digest(sys.stdin.buffer)
+        if os.path.isfile(value):
+            with open(value, 'rb', buffering=0) as fin:
+                return self.digest(fin)
+        if self._pattern.fullmatch(value):
+            return value
+        trace(f'{value!r} is not a file or a valid {self.algorithm}', TypeError, exit_code=1)
+
+    def _memoizable(self, value: str) -> bool:
+        return value != '-' and not os.path.exists(value)
+
+    def digest(self, fin: Any) -> str:
+        """digest - hex digest of a binary file object, read into one reused buffer"""
+        import hashlib
+
+        digest = hashlib.new(self.algorithm)
+        buffer = bytearray(self.buffer_size)
+        view = memoryview(buffer)
+        readinto = getattr(fin, 'readinto', None)
+        if readinto is None:
+            for chunk in _read_chunks(fin, self.buffer_size):
+                digest.update(chunk)
+            return digest.hexdigest()
+        for size in iter(lambda: readinto(buffer), 0):
+            digest.update(view[:size])
+        return digest.hexdigest()
 
 class UrlType(BaseType):
     __name__ = 'cloc.Url'
@@ -133,31 +575,194 @@ class UrlType(BaseType):
     def __call__(self, value: str):
         if URL_PATTERN.match(value):
             return value
-        trace(f'{value!r} is not a valid URL', TypeError)
+        trace(f'{value!r} is not a valid URL', TypeError, exit_code=1)
+
+class ArrayType(BaseType):
+    """ArrayType - convert comma separated numbers, or @path to a file of numbers separated by commas or whitespace,
+       into one compact array. Every value of a multiple Opt is converted into a single array and every bad value is
+       reported at once
+
+        Args:
+            typecode {str} -- array.array typecode ex: q for int64, d for float64
+            numpy {bool} -- return a numpy array of the same type instead, numpy must be installed
+    """
+    basetype: Any
+    NAMES = {'b': 'Int8', 'h': 'Int16', 'i': 'Int32', 'l': 'Long', 'q': 'Int', 'B': 'UInt8', 'H': 'UInt16',
+             'I': 'UInt32', 'L': 'ULong', 'Q': 'UInt', 'f': 'Float32', 'd': 'Float'}
+
+    def __init__(self, typecode: str = 'q', numpy: bool = False):
+        super().__init__(float if typecode in 'fd' else int)
+        self.typecode = typecode
+        self.numpy = numpy
+        self.__name__ = f'cloc.{self.NAMES.get(typecode, typecode)}Array'
+
+    def __call__(self, value: Union[str, Iterable]):
+        if not isinstance(value, str):
+            value = ','.join(map(str, value))
+        return self.convert_many([value])
+
+    def convert_many(self, values: list) -> Union['array.array', 'numpy.ndarray']:
+        tokens = self._tokens(values)
+        try:
+            if self.numpy:
+                import numpy as np
+
+                return np.array(tokens).astype(np.dtype(self.typecode)) if tokens else np.empty(0, self.typecode)
+            from array import array
+
+            return array(self.typecode, map(self.basetype, tokens))
+        except (ValueError, OverflowError, TypeError):
+            pass
+        # only a failed conversion pays for finding every bad value
+        from array import array
+
+        bad = []
+        for token in tokens:
+            try:
+                array(self.typecode, [self.basetype(token)])
+            except (ValueError, OverflowError, TypeError):
+                bad.append(token)
+        more = f' and {len(bad) - 20} more' if len(bad) > 20 else ''
+        trace(f'{len(bad)} values are not {self.__name__}: {", ".join(map(repr, bad[:20]))}{more}', TypeError,
+              exit_code=1)
+
+    def _memoizable(self, value: str) -> bool:
+        # arrays can be changed by the command that gets them
+        return False
+
+    @staticmethod
+    def _tokens(values: list) -> list:
+        """split the values on commas, values of @path are replaced by the numbers in the file"""
+        # a scan of the joined values finds commas and @ at C speed, most values need no splitting
+        lines = '\n'.join(values)
+        if ',' not in lines and '@' not in lines:
+            return values if all(values) else [value for value in values if value]
+        joined = ','.join(values)
+        if '@' in joined:
+            expanded = []
+            for value in values:
+                if value.startswith('@'):
+                    try:
+                        with open(value[1:]) as fin:
+                            expanded.append(','.join(fin.read().replace(',', ' ').split()))
+                    except OSError as e:
+                        trace(f'unable to read values from {value[1:]!r}: {e.strerror}', TypeError, exit_code=1)
+                else:
+                    expanded.append(value)
+            joined = ','.join(expanded)
+        return joined.split(',') if joined else []
+
+
+JSON_DECODERS = ('orjson', 'ujson', 'json')
+_JSON_LOADS = {}
+
+
+def _json_loads(decoder: Union[str, None]) -> Any:
+    """loads function of a json decoder by name, None is json and 'fastest' is the fastest decoder that is installed"""
+    if decoder not in _JSON_LOADS:
+        import importlib
+
+        for name in JSON_DECODERS if decoder == 'fastest' else (decoder or 'json',):
+            try:
+                _JSON_LOADS[decoder] = importlib.import_module(name).loads
+                break
+            except ImportError:
+                if decoder != 'fastest':
+                    raise
+    return _JSON_LOADS[decoder]
+
 
 class JsonType(BaseType):
+    """JsonType - convert inline json, @path to a json file or - for stdin into the decoded json. A file is read in
+       one read and decoded from bytes so the json is never passed on the command line
+
+        Args:
+            stream {bool} -- return an iterator of the items of a top level json array, decoded as they are read
+            decoder {Union[str, Callable]} -- orjson, ujson, json, fastest for the fastest decoder that is installed
+                or a loads function, defaults to json. json that another decoder rejects is decoded again with json
+            chunk_size {int} -- bytes read at a time in stream mode
+    """
     __name__ = 'cloc.Json'
     basetype: dict
 
-    def __init__(self):
+    def __init__(self, stream: bool = False, decoder: Union[str, Any] = None, chunk_size: int = 1024 * 1024):
         super().__init__(dict)
+        self.stream = stream
+        self.decoder = decoder
+        self.chunk_size = chunk_size
+
+    def __call__(self, value: Union[str, dict, list]):
+        if isinstance(value, (dict, list)):
+            return iter(value) if self.stream and isinstance(value, list) else value
+        if self.stream:
+            from cloc.streams import iter_json_array
 
-    def __call__(self, value: Union[str, dict]):
+            return iter_json_array(self._chunks(value))
+        import json
+
+        loads = self.decoder if callable(self.decoder) else _json_loads(self.decoder)
+        data = self._read(value)
         try:
-            if isinstance(value, dict):
-                return value
-            return json.loads(value)
-        except:
-            trace(f'{value!r} was not valid JSON', TypeError)
+            return loads(data)
+        except ValueError:
+            pass
+        # a faster decoder rejects some valid json, ex: NaN or integers larger than 64 bits
+        if loads is not json.loads:
+            try:
+                return json.loads(data)
+            except ValueError:
+                pass
+        trace(f'{value[:80]!r} was not valid JSON', TypeError, exit_code=1)
+
+    def _memoizable(self, value: str) -> bool:
+        return not self.stream and value != '-' and not value.startswith('@')
+
+    def _read(self, value: str) -> Union[str, bytes]:
+        import sys
+
+        if value == '-':
+            return sys.stdin.buffer.read()
+        if value.startswith('@'):
+            try:
+                with open(value[1:], 'rb') as fin:
+                    return fin.read()
+            except OSError as e:
+                trace(f'unable to read JSON from {value[1:]!r}: {e.strerror}', TypeError, exit_code=1)
+        return value
+
+    def _chunks(self, value: str) -> Iterator[Union[str, bytes]]:
+        import sys
+
+        if value == '-':
+            yield from _read_chunks(sys.stdin.buffer, self.chunk_size)
+        elif value.startswith('@'):
+            with open(value[1:], 'rb') as fin:
+                yield from _read_chunks(fin, self.chunk_size)
+        else:
+            yield value
 
 
 """
 Initializing types for users
 Choices should be initialized by the user during type set for param
+Each type is only initialized the first time it is imported, see __getattr__
 """
-Url = UrlType()
-Json = JsonType()
-Sha256 = Sha256Type()
-Date = DateType()
-File = FileType()
-IntRange = IntRangeType()
\ No newline at end of file
+_INITIALIZED_TYPES = {
+    'Url': UrlType,
+    'Json': JsonType,
+    'Sha256': Sha256Type,
+    'Date': DateType,
+    'File': FileType,
+    'IntRange': IntRangeType,
+    'IntArray': lambda: ArrayType('q'),
+    'FloatArray': lambda: ArrayType('d'),
+    'Md5': lambda: DigestType('md5'),
+    'Sha1': lambda: DigestType('sha1'),
+}
+
+def __getattr__(name: str):
+    """initialize a type on first access so the modules it depends on are only imported when it is used"""
+    if name in _INITIALIZED_TYPES:
+        globals()[name] = _INITIALIZED_TYPES[name]()
+        return globals()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
\ No newline at end of file
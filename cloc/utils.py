@@ -1,8 +1,18 @@
-import json
+import re
 import sys
+import contextvars
+import threading
 
-from colored import fg, style
-from typing import Any, Union
+from typing import Any, Iterable, Union
+
+# (stdout, stderr) sinks of the current thread or task, None writes to the real streams
+_CAPTURED = contextvars.ContextVar('cloc_captured', default=None)
+
+# number of sinks in use by every thread and task, sys.stdout and sys.stderr are only replaced while one is in use
+_IN_USE = 0
+_IN_USE_LOCK = threading.Lock()
+
+ANSI_ESCAPE_PATTERN = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
 
 def echo(message: Union[str, tuple, list, dict]= None, cls: object= None, attribute: str= None,
              list_delimiter: str = '\n', show_type: bool = False, indent: int= 4, color: str= None):
@@ -14,6 +24,7 @@ def echo(message: Union[str, tuple, list, dict]= None, cls: object= None, attrib
         show_name {bool} -- option to show attribute name on print
         show_type {bool} -- option to show type of attribute on print
     """
+    out = _stdout()
     msg = ''
     if message:
         if isinstance(message,  str):
@@ -21,36 +32,58 @@ def echo(message: Union[str, tuple, list, dict]= None, cls: object= None, attrib
         elif isinstance(message, (tuple, list)):
             msg += list_delimiter.join(message)
         elif isinstance(message, dict):
+            import json
             msg += json.dumps(message, indent=indent)
         else:
             msg += str(message)
     elif cls and attribute:
         if hasattr(cls, attribute):
-            value = getattr(cls, attribute)
-
-            msg += f'{attribute!r} '
-
-            if show_type:
-                msg += f'{type(value).__name__!r} '
-
-            if isinstance(value, dict):
-                try:
-                    msg += json.dumps(value, indent=2)
-                except TypeError:
-                    msg += str(value)
-            elif isinstance(value, (tuple, list)):
-                msg += list_delimiter.join((str(v) for v in value))
-            else:
-                msg += str(value)
+            msg += _format_attr(cls, attribute, list_delimiter, show_type)
         else:
-            print(f'Error: Unable to find attribute with name {attribute!r} in {cls!r}')
-    if color:
+            out.write(f'Error: Unable to find attribute with name {attribute!r} in {cls!r}\n')
+    out.write(_colored(msg, color, out) + '\n')
+
+def _format_attr(cls: object, attribute: str, list_delimiter: str, show_type: bool) -> str:
+    value = getattr(cls, attribute)
+
+    msg = f'{attribute!r} '
+
+    if show_type:
+        msg += f'{type(value).__name__!r} '
+
+    if isinstance(value, dict):
+        import json
         try:
-            print(f'{fg(color)}{msg}{style.RESET}')
-        except Exception:
-            print(msg)
+            msg += json.dumps(value, indent=2)
+        except TypeError:
+            msg += str(value)
+    elif isinstance(value, (tuple, list)):
+        msg += list_delimiter.join((str(v) for v in value))
     else:
-        print(msg)
+        msg += str(value)
+    return msg
+
+def _colored(msg: str, color: str, out: Any) -> str:
+    """wrap msg in the escapes of color when out shows colour, otherwise strip any escapes already in msg
+       like those of the help strings
+    """
+    if not color and '\x1b' not in msg:
+        return msg
+    show = getattr(out, 'color', None)
+    if show is None:
+        try:
+            show = out.isatty()
+        except (AttributeError, ValueError):
+            show = False
+    if not show:
+        return ANSI_ESCAPE_PATTERN.sub('', msg) if '\x1b' in msg else msg
+    if not color:
+        return msg
+    try:
+        from colored import fg, style
+        return f'{fg(color)}{msg}{style.RESET}'
+    except Exception:
+        return msg
 
 def listattrs(cls: object, verbose:bool=False):
     """listattrs - list attributes and their values for a cls
@@ -58,11 +91,13 @@ def listattrs(cls: object, verbose:bool=False):
        Args:
         cls {object} -- class to list attributes of
     """
+    lines = []
     for attr in dir(cls):
         if isinstance(getattr(cls, attr),  (bytes, str, tuple, list, dict)):
             if not verbose and (attr.startswith('__') and attr.endswith('__')):
                 continue
-            echo(cls=cls, attribute=attr, list_delimiter=', ')
+            lines.append(_format_attr(cls, attr, ', ', False) + '\n')
+    _stdout().write(''.join(lines))
 
 def trace(message:str, exception: Exception= None, raise_exception: bool= False, exit_code: int= 0, color: str= None):
     if exception and raise_exception:
@@ -70,3 +105,235 @@ def trace(message:str, exception: Exception= None, raise_exception: bool= False,
             exception(message)
     echo(message, color=color)
     sys.exit(exit_code)
+
+def import_path(path: str) -> Any:
+    """import_path - import a module and get an object from it by a path of 'package.module:attribute.attribute'
+
+       Args:
+        path {str} -- import path, if there is no ':' the module itself is returned
+    """
+    import importlib
+
+    module, _, attributes = path.partition(':')
+    obj = importlib.import_module(module)
+    for attribute in attributes.split('.') if attributes else []:
+        obj = getattr(obj, attribute)
+    return obj
+
+def _stdout() -> Any:
+    """the stream or sink stdout of the current thread or task is written to"""
+    captured = _CAPTURED.get()
+    return sys.stdout if captured is None else captured[0]
+
+def _targets() -> tuple:
+    """(stdout, stderr) the current thread or task writes to, never a _Redirect so a sink does not write to itself"""
+    captured = _CAPTURED.get()
+    if captured is not None:
+        return captured
+    return tuple(stream._stream if isinstance(stream, _Redirect) else stream for stream in (sys.stdout, sys.stderr))
+
+class BaseSink(object):
+    """BaseSink - where echo, trace, print and everything else written to stdout or stderr goes while the sink is used
+       with use_sink. Overload write to create new sinks
+
+       Args:
+        color {bool} -- keep the colour of echo, None keeps it only when the sink writes to a terminal
+    """
+    encoding = 'utf-8'
+
+    def __init__(self, color: bool = None):
+        self.color = color
+
+    def write(self, s: str) -> int:
+        return len(s)
+
+    def writelines(self, lines: Iterable[str]):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+    def __enter__(self) -> 'BaseSink':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+class NullSink(BaseSink):
+    """NullSink - throw away everything written"""
+
+class CaptureSink(BaseSink):
+    """CaptureSink - keep everything written in memory, getvalue returns it as one str"""
+
+    def __init__(self, color: bool = None):
+        super().__init__(color)
+        self._parts = []
+
+    def write(self, s: str) -> int:
+        self._parts.append(s)
+        return len(s)
+
+    def getvalue(self) -> str:
+        if len(self._parts) > 1:
+            self._parts = [''.join(self._parts)]
+        return self._parts[0] if self._parts else ''
+
+class _BufferedSink(BaseSink):
+    """join writes and only write them to the stream once buffer_size characters are written or on flush"""
+
+    def __init__(self, stream: Any, buffer_size: int = 65536, color: bool = None):
+        super().__init__(color)
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._parts = []
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def write(self, s: str) -> int:
+        with self._lock:
+            self._parts.append(s)
+            self._size += len(s)
+            if self._size < self.buffer_size:
+                return len(s)
+            parts, self._parts, self._size = self._parts, [], 0
+            self.stream.write(''.join(parts))
+        return len(s)
+
+    def flush(self):
+        with self._lock:
+            parts, self._parts, self._size = self._parts, [], 0
+            if parts:
+                self.stream.write(''.join(parts))
+            self.stream.flush()
+
+    def isatty(self) -> bool:
+        try:
+            return self.stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+class StdoutSink(_BufferedSink):
+    """StdoutSink - buffer writes to stdout, so many small writes become a few large ones
+
+       Args:
+        stream {Any} -- text stream to write to, defaults to the stdout of the thread or task that creates the sink
+        buffer_size {int} -- characters to buffer before writing to the stream
+        color {bool} -- keep the colour of echo, None keeps it only when the stream is a terminal
+    """
+
+    def __init__(self, stream: Any = None, buffer_size: int = 65536, color: bool = None):
+        super().__init__(stream or _targets()[0], buffer_size, color)
+
+class FileSink(_BufferedSink):
+    """FileSink - buffer writes to a file, a file opened by the sink is closed with the sink
+
+       Args:
+        file {Union[str, Any]} -- file path or an open text stream
+        mode {str} -- mode to open a file path with
+        buffer_size {int} -- characters to buffer before writing to the file
+        encoding {str} -- encoding to open a file path with
+    """
+
+    def __init__(self, file: Union[str, Any], mode: str = 'w', buffer_size: int = 65536, encoding: str = None):
+        self._owned = isinstance(file, str)
+        super().__init__(open(file, mode, encoding=encoding) if self._owned else file, buffer_size, False)
+
+    def close(self):
+        self.flush()
+        if self._owned:
+            self.stream.close()
+
+class use_sink(object):
+    """use_sink - context manager to send everything the current thread or task writes to stdout to a sink, and to
+       stderr when a sink is given for it. Other threads and tasks keep writing where they were. The sinks are flushed
+       on exit. While any sink is in use sys.stdout and sys.stderr are replaced, once the last one exits they are put
+       back
+
+        with use_sink(StdoutSink(buffer_size=1 << 20)):
+            cli(['list-records'])
+
+       Args:
+        sink {BaseSink} -- sink for stdout
+        stderr {BaseSink} -- sink for stderr, None keeps writing stderr where it was
+    """
+
+    def __init__(self, sink: Any, stderr: Any = None):
+        self.sink = sink
+        self.stderr = stderr
+        self._token = None
+
+    def __enter__(self) -> Any:
+        global _IN_USE
+
+        targets = _targets()
+        with _IN_USE_LOCK:
+            _IN_USE += 1
+            if not isinstance(sys.stdout, _Redirect):
+                sys.stdout = _Redirect(sys.stdout, 0)
+            if not isinstance(sys.stderr, _Redirect):
+                sys.stderr = _Redirect(sys.stderr, 1)
+        self._token = _CAPTURED.set((self.sink, self.stderr or targets[1]))
+        return self.sink
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        global _IN_USE
+
+        try:
+            self.sink.flush()
+            if self.stderr is not None:
+                self.stderr.flush()
+        finally:
+            _CAPTURED.reset(self._token)
+            with _IN_USE_LOCK:
+                _IN_USE -= 1
+                if not _IN_USE:
+                    # streams replaced by something else since are left alone
+                    if isinstance(sys.stdout, _Redirect):
+                        sys.stdout = sys.stdout._stream
+                    if isinstance(sys.stderr, _Redirect):
+                        sys.stderr = sys.stderr._stream
+
+class _Redirect(object):
+    """_Redirect - replaces sys.stdout or sys.stderr while a sink is in use. Writes go to the sink of the current
+       thread or task, or to the original stream when the thread or task uses no sink
+    """
+
+    def __init__(self, stream: Any, index: int):
+        self._stream = stream
+        self._index = index
+
+    def _target(self):
+        captured = _CAPTURED.get()
+        return self._stream if captured is None else captured[self._index]
+
+    def write(self, s: str) -> int:
+        return self._target().write(s)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self._target(), name)
+
+class capture(use_sink):
+    """capture - context manager to capture everything written to stdout and stderr by the current thread or task,
+       other threads and tasks keep writing to the real streams
+
+        with capture() as (out, err):
+            cli(['hello-world', 'name'])
+        out.getvalue()
+    """
+
+    def __init__(self):
+        super().__init__(CaptureSink(), CaptureSink())
+
+    def __enter__(self) -> tuple:
+        super().__enter__()
+        return self.sink, self.stderr
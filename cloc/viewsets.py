@@ -1,11 +1,10 @@
-import json
-import requests
+import sys
 
-from cloc import mixins, arg, opt, cmd
+from cloc import mixins, arg, opt, cmd, flg
 from cloc.utils import echo
 from cloc.types import Url, Json
 
-from typing import Any, Union
+from typing import Any, Callable, Iterator, Union
 
 class BaseQueryset(object):
     model: Any
@@ -46,20 +45,32 @@ class ReadOnlyViewset(GrpViewset, mixins.Echo, mixins.List, mixins.Version):
 
 class ReqSessionViewset(GrpViewset, mixins.Version):
     """Requests Session Viewset"""
-    session: requests.Session
+    session: 'requests.Session'
+    cache: 'cloc.cache.ResponseCache'
     version: str= '1.0.0'
 
 
-    def __init__(self, *args, session: requests.Session= None ,max_retries: int= 3,
-                 pool_connections: int= 16, pool_maxsize: int= 16,  raise_exception: bool= True, **kwargs):
+    def __init__(self, *args, session: 'requests.Session'= None ,max_retries: int= 3,
+                 pool_connections: int= 16, pool_maxsize: int= 16,  raise_exception: bool= True,
+                 cache: Union[str, 'cloc.cache.ResponseCache']= None, **kwargs):
         super().__init__(*args, **kwargs)
+        # a directory given as cache opts in to caching get responses on disk
+        if isinstance(cache, str):
+            from cloc.cache import ResponseCache
+
+            cache = ResponseCache(cache)
+        self.cache = cache
+        # requests is only imported once a session is needed
+        import requests
+        import requests.adapters
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.raise_exception = raise_exception
         if session:
             self.session = session
         else:
-            self.pool_connections = pool_connections
-            self.pool_maxsize = pool_maxsize
-            self.max_retries = max_retries
-            self.raise_exception = raise_exception
             self.session = requests.Session()
             session_adapters = requests.adapters.HTTPAdapter(
                 pool_connections=self.pool_connections,
@@ -74,9 +85,191 @@ class ReqSessionViewset(GrpViewset, mixins.Version):
     @opt('--headers', '-hd', type=Json, default={}, help='headers for get request')
     @opt('--params', '-p', type=Json, default={}, help='params for get requests')
     @opt('--data', '-d', type=Json, default={}, help='data for get requests')
-    def get_command(self, url: Url, headers: Json, params: Json, data: Json):
+    @opt('--output', '-o', type=str, help='file to stream the response body to')
+    @flg('--stream', '-s', help='stream the response body to stdout as it is read')
+    @flg('--ndjson', '-nd', help='stream the items of a json array response as one line of json each')
+    @opt('--retries', '-r', type=int, default=3, help='times to retry and resume a streamed response')
+    async def get_command(self, url: Url, headers: Json, params: Json, data: Json, output: str, stream: bool,
+                          ndjson: bool, retries: int):
         """session get requests"""
-        echo(self.session.get(url, headers=headers, params=params, data=data).json())
+        if output or stream or ndjson:
+            await self._request(self._stream, url, output, ndjson, retries, headers=headers, params=params, data=data)
+            return
+        echo((await self._request(self._get, url, headers=headers, params=params, data=data)).json())
+
+    def _stream(self, url: str, output: str = None, ndjson: bool = False, retries: int = 3, **kwargs):
+        """write the response body to output or stdout with bounded memory, as raw bytes or as a line of json
+           for each item of a json array
+        """
+        import codecs
+
+        chunks = self._iter_content(url, retries, **kwargs)
+        if ndjson:
+            import json
+            from cloc.streams import iter_json_array
+
+            lines = (json.dumps(item) + '\n' for item in iter_json_array(chunks))
+            chunks = (line.encode() for line in lines) if output else lines
+        if output:
+            with open(output, 'wb') as fout:
+                for chunk in chunks:
+                    fout.write(chunk)
+            return
+        sys.stdout.flush()
+        buffer = getattr(sys.stdout, 'buffer', None)
+        if buffer is not None and not ndjson:
+            for chunk in chunks:
+                buffer.write(chunk)
+            buffer.flush()
+            return
+        # stdout only takes text when it is captured
+        for text in chunks if ndjson else codecs.iterdecode(chunks, 'utf-8', 'replace'):
+            sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def _iter_content(self, url: str, retries: int = 3, backoff: float = 0.5, chunk_size: int = 65536,
+                      **kwargs) -> Iterator[bytes]:
+        """yield the response body in chunks, if the connection drops or the server is unavailable the request is
+           retried with exponential backoff and resumed with a Range request from the last byte yielded
+        """
+        import time
+        import requests
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        position, attempt = 0, 0
+        while True:
+            resumable = True
+            try:
+                with self.session.get(url, headers=headers, stream=True, **kwargs) as response:
+                    if response.status_code in (429, 500, 502, 503, 504) and attempt < retries:
+                        raise requests.ConnectionError(f'{response.status_code} {response.reason}')
+                    if position and response.status_code != 206:
+                        # raised instead of traced, so the message does not end up in a body written to stdout
+                        raise requests.RequestException(f'{url!r} can not be resumed, the server did not return the '
+                                                        'requested range')
+                    if self.raise_exception:
+                        response.raise_for_status()
+                    # a Range is of the encoded body, a decoded body can not be resumed
+                    resumable = response.headers.get('Content-Encoding', 'identity') == 'identity'
+                    if response.headers.get('ETag') and not position:
+                        headers['If-Range'] = response.headers['ETag']
+                    for chunk in response.iter_content(chunk_size):
+                        position += len(chunk)
+                        yield chunk
+                return
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+                if attempt >= retries or (position and not resumable):
+                    raise
+                time.sleep(backoff * 2 ** attempt)
+                attempt += 1
+                if position:
+                    headers['Range'] = f'bytes={position}-'
+
+    def _get(self, url: str, **kwargs) -> 'requests.Response':
+        """session.get through the response cache if there is one"""
+        if self.cache is None:
+            return self.session.get(url, **kwargs)
+        return self.cache.get(self.session, url, **kwargs)
+
+    async def _request(self, method: Callable, *args, **kwargs) -> 'requests.Response':
+        """run a blocking session request in the default executor so other commands can run on the event loop"""
+        import asyncio
+        from functools import partial
+
+        import contextvars
+
+        # the context is copied so output written by the request is captured with the command that made it
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(None, partial(context.run, method, *args, **kwargs))
+
+    @cmd('get-many')
+    @opt('--url', '-u', type=Url, multiple=True, help='url for get requests, can be given many times')
+    @opt('--file', '-f', type=str, help='file with one url per line, - for stdin (default if no --url)')
+    @opt('--headers', '-hd', type=Json, default={}, help='headers for every get request')
+    @opt('--params', '-p', type=Json, default={}, help='params for every get request')
+    @opt('--workers', '-w', type=int, help='number of requests at once, defaults to pool_maxsize')
+    def get_many_command(self, url: list, file: str, headers: Json, params: Json, workers: int):
+        """session get requests for many urls, one line of json per response as they complete"""
+        import json
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        from cloc.batch import submit
+
+        workers = workers or self.pool_maxsize
+        urls = self._read_urls(url or [], file if file or url else '-')
+        latencies, total, failed, start = [], 0, 0, time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            tasks = ((self._get_record, u, headers, params) for u in urls)
+            for record in submit(executor, tasks, workers * 4, False):
+                total += 1
+                failed += 'error' in record
+                if 'elapsed' in record:
+                    latencies.append(record['elapsed'])
+                sys.stdout.write(json.dumps(record) + '\n')
+                sys.stdout.flush()
+        self._write_stats(total, failed, latencies, time.perf_counter() - start)
+        if failed:
+            sys.exit(1)
+
+    @staticmethod
+    def _read_urls(urls: list, file: str = None) -> Iterator[str]:
+        """urls given by --url then one url per line of file, - reads stdin"""
+        yield from urls
+        if file is None:
+            return
+        fin = sys.stdin if file == '-' else open(file)
+        try:
+            for line in fin:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+        finally:
+            if fin is not sys.stdin:
+                fin.close()
+
+    def _get_record(self, url: str, headers: dict, params: dict) -> dict:
+        """get one url with the pooled session and return a json serializable record of the response"""
+        import time
+        from cloc.types import URL_PATTERN
+
+        if not URL_PATTERN.match(url):
+            return {'url': url, 'error': f'{url!r} is not a valid URL'}
+        start = time.perf_counter()
+        try:
+            response = self._get(url, headers=headers, params=params)
+        except Exception as e:
+            return {'url': url, 'elapsed': time.perf_counter() - start, 'error': f'{type(e).__name__}: {e}'}
+        record = {'url': url, 'status': response.status_code, 'elapsed': time.perf_counter() - start}
+        try:
+            record['body'] = response.json()
+        except ValueError:
+            record['body'] = response.text
+        if self.raise_exception and response.status_code >= 400:
+            record['error'] = f'{response.status_code} {response.reason}'
+        return record
+
+    @cmd('cache-stats')
+    def cache_stats_command(self):
+        """hit and miss counters of the response cache"""
+        if self.cache is None:
+            echo('no response cache, give ReqSessionViewset a cache directory to cache responses', color='red')
+            return
+        echo(self.cache.stats())
+
+    @staticmethod
+    def _write_stats(total: int, failed: int, latencies: list, elapsed: float):
+        """write throughput and latency stats of a get-many to stderr"""
+        latencies = sorted(latencies)
+
+        def percentile(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+
+        mean = sum(latencies) / len(latencies) * 1000 if latencies else 0.0
+        sys.stderr.write(f'{total} requests, {failed} failed in {elapsed:.3f}s '
+                         f'({total / elapsed if elapsed else 0.0:.1f} req/s)\n'
+                         f'latency ms: min {percentile(0):.1f} mean {mean:.1f} p50 {percentile(.5):.1f} '
+                         f'p95 {percentile(.95):.1f} p99 {percentile(.99):.1f} max {percentile(1):.1f}\n')
 
 
 
@@ -0,0 +1,63 @@
+import asyncio
+
+from cloc import grp, cmd, arg
+from cloc.utils import capture, echo
+
+loops = []
+barrier = None
+
+
+@grp('cli')
+async def cli():
+    await asyncio.sleep(0)
+    loops.append(asyncio.get_running_loop())
+
+
+@cmd('loop')
+async def loop_command():
+    loops.append(asyncio.get_running_loop())
+    return 'done'
+
+
+@cmd('work')
+@arg('name', type=str, help='name of the task')
+async def work(name):
+    echo(f'{name} start')
+    # every dispatch waits here until all of them have started, so they must run at the same time
+    await barrier.wait()
+    echo(f'{name} end')
+    return name
+
+
+cli.add_command(loop_command)
+cli.add_command(work)
+
+
+def test_async_grp_and_cmd_share_one_loop():
+    loops.clear()
+    assert cli(['loop']) == 'done'
+    assert len(loops) == 2 and loops[0] is loops[1]
+
+    async def main():
+        loops.clear()
+        assert await cli.dispatch(['loop']) == 'done'
+        return asyncio.get_running_loop()
+    running = asyncio.run(main())
+    assert loops == [running, running]
+
+
+def test_gathered_dispatches_run_concurrently_without_mixing_output():
+    names = [f'task-{i}' for i in range(20)]
+
+    async def one(name):
+        with capture() as (out, _):
+            result = await cli.dispatch(['work', name])
+        return result, out.getvalue()
+
+    async def main():
+        global barrier
+        barrier = asyncio.Barrier(len(names))
+        return await asyncio.wait_for(asyncio.gather(*map(one, names)), 5)
+
+    results = asyncio.run(main())
+    assert results == [(name, f'{name} start\n{name} end\n') for name in names]
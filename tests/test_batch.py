@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cloc import grp, cmd, arg, opt
+from cloc.types import Choices
+from cloc.batch import read_cmdls, run, run_processes, submit
+from cloc.utils import echo
+
+
+@grp('cli')
+def cli():
+    pass
+
+
+@cmd('hi')
+@arg('n', type=int, help='number')
+def hi(n):
+    echo(f'hi {n}')
+
+
+@cmd('pick')
+@opt('--color', '-c', type=Choices(['red', 'blue']), required=True, help='color')
+def pick(color):
+    echo(color)
+
+
+cli.add_command(hi)
+cli.add_command(pick)
+
+
+def test_submit_keeps_order_and_window():
+    submitted = []
+
+    def tasks():
+        for i in range(50):
+            submitted.append(i)
+            yield (lambda i: (time.sleep(0.001 * (i % 3)), i)[1], i)
+
+    with ThreadPoolExecutor(4) as executor:
+        results = submit(executor, tasks(), window=8)
+        assert next(results) == 0
+        assert len(submitted) <= 9
+        assert [0] + list(results) == list(range(50))
+
+
+def test_submit_unordered():
+    with ThreadPoolExecutor(4) as executor:
+        assert sorted(submit(executor, ((abs, -i) for i in range(20)), window=4, ordered=False)) == list(range(20))
+
+
+def test_run_captures_every_command_line():
+    cmdls = read_cmdls(iter(['hi 1\n', 'hi x\n', 'hi 2\n']))
+    results = list(run(cli, cmdls, workers=2))
+    assert [r.output for r in results] == ['hi 1\n', '', 'hi 2\n']
+    assert [r.exit_code for r in results] == [0, 1, 0]
+
+
+def test_usage_errors_exit_non_zero():
+    cmdls = [['pick', '-c', 'red'], ['pick', '-c', 'green'], ['pick'], ['nope'], [], ['hi', 'x'], ['hi', '--help']]
+    results = list(run(cli, cmdls))
+    assert [r.exit_code for r in results] == [0, 1, 1, 1, 1, 1, 0]
+    assert 'not found in choices' in results[1].output and 'USAGE: hi' in results[6].output
+
+
+TREE = '''import os
+
+from cloc import grp, cmd, arg
+from cloc.utils import echo, trace
+
+
+@grp('cli')
+def cli():
+    pass
+
+
+@cmd('square')
+@arg('n', type=int, help='number')
+def square(n):
+    if n % 5 == 4:
+        trace(f'{n} is not allowed', exit_code=2)
+    echo(f'{n * n} {os.getpid()}')
+
+
+cli.add_command(square)
+'''
+
+
+@pytest.mark.parametrize('method', [m for m in ('fork', 'spawn') if m in multiprocessing.get_all_start_methods()])
+def test_run_processes(tmp_path, monkeypatch, method):
+    (tmp_path / 'batch_tree.py').write_text(TREE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    cmdls = [['square', str(n)] for n in range(23)]
+    results = list(run_processes('batch_tree:cli', iter(cmdls), processes=2, chunksize=4,
+                                 mp_context=multiprocessing.get_context(method)))
+    assert [r.index for r in results] == list(range(23))
+    assert [r.cmdl for r in results] == cmdls
+    assert [r.exit_code for r in results] == [2 if n % 5 == 4 else 0 for n in range(23)]
+    assert [r.output for r in results if r.exit_code] == [f'{n} is not allowed\n' for n in range(4, 23, 5)]
+    assert [int(r.output.split()[0]) for r in results if not r.exit_code] == [n * n for n in range(23) if n % 5 != 4]
+    pids = {int(r.output.split()[1]) for r in results if r.exit_code == 0}
+    assert 1 <= len(pids) <= 2 and os.getpid() not in pids
+
+    unordered = run_processes('batch_tree:cli', iter(cmdls), processes=2, chunksize=3, ordered=False,
+                              mp_context=multiprocessing.get_context(method))
+    assert sorted(r.index for r in unordered) == list(range(23))
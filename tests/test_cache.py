@@ -0,0 +1,75 @@
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+requests = pytest.importorskip('requests')
+
+from cloc.cache import ResponseCache
+
+
+class Handler(BaseHTTPRequestHandler):
+    """responds with the Authorization header and Cookie the request was made with, cacheable for a minute"""
+
+    def do_GET(self):
+        body = f'{self.headers.get("Authorization")}|{self.headers.get("Cookie")}'.encode()
+        self.send_response(200)
+        self.send_header('Cache-Control', 'max-age=60')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/private'
+    server.shutdown()
+
+
+def session(**headers) -> 'requests.Session':
+    s = requests.Session()
+    s.headers.update(headers)
+    return s
+
+
+def test_cache_hit(url, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    s = session()
+    assert cache.get(s, url).text == cache.get(s, url).text
+    assert cache.stats()['hits'] == 1
+
+
+def test_session_headers_are_part_of_the_key(url, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    assert cache.get(session(Authorization='Bearer a'), url).text == 'Bearer a|None'
+    assert cache.get(session(Authorization='Bearer b'), url).text == 'Bearer b|None'
+    assert cache.get(session(Authorization='Bearer a'), url).text == 'Bearer a|None'
+
+
+def test_session_auth_and_cookies_are_part_of_the_key(url, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    alice, bob = session(), session()
+    alice.auth, bob.auth = ('alice', 'a'), ('bob', 'b')
+    assert cache.get(alice, url).text != cache.get(bob, url).text
+
+    alice, bob = session(), session()
+    alice.cookies.set('id', 'alice')
+    bob.cookies.set('id', 'bob')
+    assert cache.get(alice, url).text == 'None|id=alice'
+    assert cache.get(bob, url).text == 'None|id=bob'
+
+
+def test_auth_objects_are_not_cached(url, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    s = session()
+    s.auth = requests.auth.HTTPBasicAuth('alice', 'a')
+    cache.get(s, url)
+    cache.get(s, url)
+    assert cache.stats()['entries'] == 0
@@ -0,0 +1,107 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX') or not hasattr(os, 'fork'),
+                                reason='the daemon needs Unix domain sockets and fork')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TREE = '''import os
+import sys
+
+from cloc import grp, cmd, arg
+from cloc.utils import echo, trace
+
+
+@grp('cli')
+def cli():
+    pass
+
+
+@cmd('hello')
+@arg('name', type=str, help='name')
+def hello(name):
+    echo(f'hello {name} {os.getpid()}')
+
+
+@cmd('where')
+def where():
+    echo(f'{os.getcwd()} {os.environ.get("DAEMON_TEST")} {sys.stdin.read().upper()}')
+
+
+@cmd('fail')
+def fail():
+    trace('failed', exit_code=3)
+
+
+cli.add_command(hello)
+cli.add_command(where)
+cli.add_command(fail)
+'''
+
+
+@pytest.fixture
+def env(tmp_path):
+    (tmp_path / 'daemon_tree.py').write_text(TREE)
+    return dict(os.environ, PYTHONPATH=os.pathsep.join([str(tmp_path), ROOT]), DAEMON_TEST='client')
+
+
+def run_client(env: dict, *argv: str, input: str = '', cwd: str = None) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, '-m', 'cloc.daemon', *argv], env=env, input=input, cwd=cwd,
+                          capture_output=True, text=True, timeout=30)
+
+
+def test_client_invokes_the_tree_of_a_server(tmp_path, env):
+    path = str(tmp_path / 'cli.sock')
+    server = subprocess.Popen([sys.executable, '-m', 'cloc.daemon', '--serve', 'daemon_tree:cli', path],
+                              env=dict(env, DAEMON_TEST='server'))
+    try:
+        for _ in range(200):
+            if os.path.exists(path):
+                break
+            time.sleep(0.05)
+        first, second = run_client(env, path, 'hello', 'a'), run_client(env, path, 'hello', 'b')
+        assert first.returncode == second.returncode == 0
+        assert first.stdout.split()[:2] == ['hello', 'a'] and second.stdout.split()[:2] == ['hello', 'b']
+        # every request is served by a new child of the server
+        pids = {int(first.stdout.split()[2]), int(second.stdout.split()[2]), server.pid}
+        assert len(pids) == 3
+
+        where = run_client(env, path, 'where', input='stdin', cwd=str(tmp_path))
+        assert (where.returncode, where.stdout) == (0, f'{tmp_path} client STDIN\n')
+
+        failed = run_client(env, path, 'fail')
+        assert (failed.returncode, failed.stdout) == (3, 'failed\n')
+    finally:
+        server.terminate()
+        server.wait(10)
+    assert not os.path.exists(path)
+
+
+def test_client_falls_back_to_the_tree_when_no_server_is_running(tmp_path, env):
+    path = str(tmp_path / 'missing.sock')
+    result = run_client(env, '--fallback', 'daemon_tree:cli', path, 'hello', 'a')
+    assert result.returncode == 0 and result.stdout.split()[:2] == ['hello', 'a']
+    result = run_client(env, '--fallback', 'daemon_tree:cli', path, 'fail')
+    assert (result.returncode, result.stdout) == (3, 'failed\n')
+
+    result = run_client(env, path, 'hello', 'a')
+    assert result.returncode == 1 and 'no server is listening' in result.stderr
+
+
+def test_client_fallback_in_process(tmp_path, env, monkeypatch):
+    from cloc.daemon import client
+    from cloc.utils import capture
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    with capture() as (out, _):
+        assert client(str(tmp_path / 'missing.sock'), ['hello', 'a'], fallback='daemon_tree:cli') == 0
+    assert out.getvalue() == f'hello a {os.getpid()}\n'
+    with pytest.raises(FileNotFoundError):
+        client(str(tmp_path / 'missing.sock'), ['hello', 'a'])
+    sys.modules.pop('daemon_tree', None)
@@ -0,0 +1,131 @@
+import sys
+
+import pytest
+
+from cloc.core import Cmd, CommandTrie, Grp, LazyCmd, Params
+
+
+def command(name: str, hidden: bool = False) -> Cmd:
+    return Cmd(name, lambda: name, Params(), hidden)
+
+
+def group(names: list, prefix: bool = False) -> Grp:
+    grp = Grp('cli', lambda: None, params=Params(), prefix=prefix)
+    for name in names:
+        grp.add_command(command(name))
+    return grp
+
+
+def test_get_command_by_name():
+    grp = group([f'resource-{i}' for i in range(10000)])
+    assert grp.get_command('resource-9999').name == 'resource-9999'
+    assert grp.get_command('resource-99999') is None
+    assert grp.get_command('resource-99').name == 'resource-99'
+
+
+def test_first_command_added_with_a_name_wins():
+    grp = group(['dup'])
+    second = command('dup')
+    grp.add_command(second)
+    assert grp.get_command('dup') is not second
+    assert len(grp.commands) == 2
+
+
+def test_prefix_dispatch():
+    grp = group(['status', 'start', 'stop', 'list'], prefix=True)
+    assert grp.get_command('l').name == 'list'
+    assert grp.get_command('stat').name == 'status'
+    assert grp.get_command('st') is None
+    assert group(['status'], prefix=False).get_command('stat') is None
+    # a command added after the trie was built is found by prefix too
+    grp.add_command(command('remove'))
+    assert grp.get_command('rem').name == 'remove'
+    assert grp(['sto']) == 'stop'
+
+
+def test_exact_name_wins_over_longer_names():
+    trie = CommandTrie(['get', 'get-many'])
+    assert trie.resolve('get') == 'get'
+    assert trie.resolve('get-') == 'get-many'
+    assert trie.resolve('g') is None
+
+
+def test_complete_skips_hidden_commands():
+    grp = group(['build', 'bump'])
+    grp.add_command(command('bundle', hidden=True))
+    assert grp.complete('b') == ['build', 'bump']
+    assert grp.complete('x') == []
+
+
+def test_lazy_command_is_imported_when_invoked(tmp_path, monkeypatch):
+    (tmp_path / 'lazy_grp_cmds.py').write_text('from cloc import cmd\n\n@cmd("late")\ndef late():\n    return "late"\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    grp = group([])
+    grp.add_command('lazy_grp_cmds:late')
+    assert isinstance(grp.get_command('late'), LazyCmd)
+    assert 'lazy_grp_cmds' not in sys.modules
+    assert grp(['late']) == 'late'
+    del sys.modules['lazy_grp_cmds']
+
+
+def test_lazy_command_is_listed_by_the_name_it_is_invoked_by(tmp_path, monkeypatch):
+    (tmp_path / 'lazy_grp_named.py').write_text('from cloc import cmd\n\n@cmd("get")\ndef get_command():\n'
+                                                '    return "got"\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    grp = group([])
+    grp.add_command('lazy_grp_named:get_command')
+    assert grp.get_command_names() == ['get_command']
+    assert grp(['get_command']) == 'got'
+    with pytest.raises(SystemExit):
+        grp(['get'])
+
+    grp = group([])
+    grp.add_command('lazy_grp_named:get_command', name='get')
+    assert grp.get_command_names() == ['get']
+    assert grp(['get']) == 'got'
+    del sys.modules['lazy_grp_named']
+
+
+def test_bound_commands_share_params():
+    from cloc import cmd, opt
+
+    class Viewset(object):
+        @cmd('show')
+        @opt('--id', '-i', type=str)
+        def show_command(self, id):
+            return self, id
+
+    first, second = Viewset(), Viewset()
+    grp = group([])
+    grp.add_command(first)
+    grp.add_command(second)
+    a, b = grp.commands
+    assert a.params is b.params and not hasattr(a, '__dict__')
+    assert a(['-i', '1']) == (first, '1')
+    assert b(['-i', '2']) == (second, '2')
+
+
+def test_unknown_command_prints_help():
+    with pytest.raises(SystemExit):
+        group(['a'])(['b'])
+
+
+def test_prefix_is_not_taken_from_args_or_empty_tokens():
+    from cloc import grp, cmd, arg
+
+    @grp('tenant', prefix=True)
+    @arg('name', type=str)
+    def tenant(name):
+        seen.append(name)
+
+    @cmd('status')
+    def status_command():
+        return 'status'
+
+    seen = []
+    tenant.add_command(status_command)
+    assert tenant(['st', 'stat']) == 'status'
+    assert tenant(['st', '', 'status']) == 'status'
+    assert seen == ['st', 'st']
+    assert tenant.get_command('') is None
+    assert tenant.get_command('st', prefix=False) is None
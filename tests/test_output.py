@@ -0,0 +1,84 @@
+import asyncio
+import io
+import json
+import sys
+
+import pytest
+
+from cloc import cmd, arg
+from cloc.streams import write_records
+from cloc.utils import capture
+
+
+@cmd('numbers')
+@arg('n', type=int)
+def numbers(n):
+    return iter(range(n))
+
+
+@cmd('records', output='ndjson')
+@arg('n', type=int)
+def records(n):
+    for i in range(n):
+        yield {'i': i}
+
+
+@cmd('arecords', output='json')
+@arg('n', type=int)
+async def arecords(n):
+    for i in range(n):
+        await asyncio.sleep(0)
+        yield i
+
+
+def test_iterators_are_returned_by_default():
+    assert list(numbers(['3'])) == [0, 1, 2]
+
+
+def test_output_streams_records():
+    with capture() as (out, _):
+        assert records(['3']) == 3
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == [{'i': 0}, {'i': 1}, {'i': 2}]
+
+
+def test_output_streams_async_generators():
+    with capture() as (out, _):
+        assert arecords(['3']) == 3
+    assert json.loads(out.getvalue()) == [0, 1, 2]
+
+    async def dispatch():
+        with capture() as (out, _):
+            assert await arecords.dispatch(['2']) == 2
+        return out.getvalue()
+    assert json.loads(asyncio.run(dispatch())) == [0, 1]
+
+
+def test_output_is_validated():
+    with pytest.raises(ValueError):
+        cmd('bad', output='xml')(lambda: None)
+
+
+@pytest.mark.parametrize('format, expected', [
+    ('lines', "{'a': 1}\n{'a': 2}\n"),
+    ('ndjson', '{"a":1}\n{"a":2}\n'),
+    ('csv', 'a\n1\n2\n'),
+    ('json', '[\n{"a":1},\n{"a":2}\n]\n'),
+])
+def test_write_records(format, expected):
+    stream = io.StringIO()
+    assert write_records(({'a': i} for i in (1, 2)), format, stream, flush_every=1) == 2
+    assert stream.getvalue() == expected
+
+
+def test_write_records_empty_json_array():
+    stream = io.StringIO()
+    assert write_records(iter(()), 'json', stream) == 0
+    assert json.loads(stream.getvalue()) == []
+
+
+def test_streams_not_imported_by_default_commands():
+    import subprocess
+
+    code = 'import sys\nfrom cloc import cmd\ncmd("x")(lambda: None)\nprint("cloc.streams" in sys.modules)'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
@@ -0,0 +1,99 @@
+import pytest
+
+from cloc import grp, cmd, arg, opt, flg
+from cloc.core import Opt, Params
+
+
+@cmd('wide')
+@arg('name', type=str)
+@arg('count', type=int)
+@opt('--level', '-l', type=int, default=3)
+@opt('--tag', '-t', type=str, multiple=True)
+@opt('--token', '-k', type=str)
+@flg('--verbose', '-v')
+def wide(name, count, level, tag, token, verbose):
+    return name, count, level, tag, token, verbose
+
+
+@cmd('needs')
+@opt('--id', '-i', type=str, required=True)
+def needs(id):
+    return id
+
+
+def test_args_opts_and_flags():
+    assert wide(['a', '2']) == ('a', 2, 3, None, None, False)
+    assert wide(['a', '2', '-l', '5', '--verbose', '-t', 'x', '--tag', 'y', '-k', 'secret']) == \
+        ('a', 2, 5, ['x', 'y'], 'secret', True)
+
+
+def test_params_can_come_in_any_order():
+    assert wide(['-v', '--level', '1', 'a', '-t', 'x', '2']) == ('a', 2, 1, ['x'], None, True)
+
+
+def test_first_value_of_a_repeated_opt_wins():
+    assert wide(['a', '2', '-l', '5', '-l', '6'])[2] == 5
+
+
+def test_required_opt():
+    assert needs(['-i', '7']) == '7'
+    with pytest.raises(SystemExit):
+        needs([])
+
+
+def test_opt_in_place_of_an_arg():
+    with pytest.raises(SystemExit):
+        wide(['a', '--unknown'])
+
+
+def test_parse_is_a_single_pass_over_large_command_lines():
+    params = Params(fn=lambda values: values, order=[Opt('--value', '-x', type=int, multiple=True)])
+    cmdl = [token for i in range(100000) for token in ('-x', str(i))]
+    values, index = params.parse(cmdl)
+    assert values == [list(range(100000))] and index == len(cmdl)
+
+
+def test_invocations_do_not_share_state():
+    assert wide(['a', '2', '-t', 'x']) == ('a', 2, 3, ['x'], None, False)
+    assert wide(['b', '3']) == ('b', 3, 3, None, None, False)
+
+
+def test_grp_passes_the_rest_of_the_command_line():
+    seen = []
+
+    @grp('cli')
+    @flg('--debug', '-d')
+    def cli(debug):
+        seen.append(debug)
+
+    @cmd('echo')
+    @arg('value', type=str)
+    def echo_command(value):
+        return value
+
+    cli.add_command(echo_command)
+    assert cli(['-d', 'echo', 'hi']) == 'hi'
+    assert cli(['echo', 'there']) == 'there'
+    assert seen == [True, False]
+
+
+def test_help_of_a_grp_with_an_arg():
+    from cloc.utils import capture
+
+    @grp('tenant')
+    @arg('name', type=str, help='tenant name')
+    @opt('--region', '-r', type=int, required=True, help='region id')
+    def tenant(name, region):
+        pass
+
+    @cmd('show')
+    def show_command():
+        return 'shown'
+
+    tenant.add_command(show_command)
+    for cmdl in (['--help'], ['acme', '--help'], []):
+        with capture() as (out, _):
+            with pytest.raises(SystemExit):
+                tenant(cmdl)
+        assert 'USAGE: tenant' in out.getvalue() and 'Order of cmd parameters' not in out.getvalue()
+    assert tenant(['acme', '-r', '1', 'show']) == 'shown'
@@ -0,0 +1,81 @@
+import sys
+
+import pytest
+
+from cloc.core import Grp, LazyCmd
+from cloc.snapshot import cached, dump, load
+from cloc.utils import capture, import_path
+
+TREE = '''
+from cloc import grp, cmd
+from cloc.snapshot import noop
+from cloc.utils import echo
+
+@grp('cli')
+@noop
+def cli():
+    pass
+
+@grp('plain')
+def plain():
+    pass
+
+@cmd('hi')
+def hi():
+    echo('hi')
+
+cli.add_command(hi)
+cli.add_command(plain)
+cli.add_command('{package}.lazy:late')
+'''
+
+LAZY = '''
+from cloc import cmd
+from cloc.utils import echo
+
+@cmd('late')
+def late():
+    echo('late')
+'''
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    name = f'snapcli_{tmp_path.name}'
+    root = tmp_path / name
+    root.mkdir()
+    (root / '__init__.py').write_text('')
+    (root / 'tree.py').write_text(TREE.format(package=name))
+    (root / 'lazy.py').write_text(LAZY)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield name
+    for module in [m for m in sys.modules if m.startswith(name)]:
+        del sys.modules[module]
+
+
+def test_dump_with_lazy_command_not_imported(package, tmp_path):
+    root = f'{package}.tree:cli'
+    path = str(tmp_path / 'cli.snapshot')
+    assert dump(import_path(root), path, root)
+    assert f'{package}.lazy' not in sys.modules
+
+    tree = load(path, root)
+    assert isinstance(tree, Grp)
+    commands = {c.name: c for c in tree.commands}
+    # the noop group is saved with its commands, the plain group by its path
+    assert isinstance(commands['hi'], LazyCmd) and isinstance(commands['plain'], LazyCmd)
+    assert commands['late'].path == f'{package}.lazy:late'
+
+
+def test_cached_loads_snapshot(package, tmp_path):
+    root = f'{package}.tree:cli'
+    path = str(tmp_path / 'cli.snapshot')
+    cached(path, root)
+    for module in [m for m in sys.modules if m.startswith(package)]:
+        del sys.modules[module]
+
+    tree = cached(path, root)
+    assert f'{package}.tree' not in sys.modules
+    with capture() as (out, _):
+        tree(['late'])
+    assert out.getvalue() == 'late\n'
@@ -0,0 +1,50 @@
+import json
+import random
+
+import pytest
+
+from cloc.streams import iter_json_array
+from cloc.types import JsonType
+
+DOCUMENTS = [
+    '[12345.678]',
+    '[1e+5, -2.5E-3, 0, -0, true, false, null, "a,]", {"k": [1, 2]}, []]',
+    '[]',
+    ' [ ] ',
+    '["é€\U0001f600"]',
+]
+
+INVALID = ['[1]x', '[1] ]', '[1,]', '[,1]', '[1 2]', '[1', '{}', '[1.]', '[tru]', '']
+
+
+def bytewise(document: str) -> list:
+    data = document.encode()
+    return [data[i:i + 1] for i in range(len(data))]
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+def test_iter_json_array_one_byte_at_a_time(document):
+    assert list(iter_json_array(bytewise(document))) == json.loads(document)
+    assert list(iter_json_array([document])) == json.loads(document)
+
+
+@pytest.mark.parametrize('document', INVALID)
+def test_iter_json_array_invalid(document):
+    with pytest.raises(ValueError):
+        list(iter_json_array(bytewise(document)))
+    with pytest.raises(ValueError):
+        list(iter_json_array([document]))
+
+
+def test_iter_json_array_floats_in_chunks():
+    rng = random.Random(0)
+    values = [rng.random() * 10 ** rng.randint(-5, 5) for _ in range(50000)]
+    data = json.dumps(values).encode()
+    for size in (7, 4096, 65536):
+        assert list(iter_json_array(data[i:i + size] for i in range(0, len(data), size))) == values
+
+
+def test_json_type_stream_one_byte_at_a_time(tmp_path):
+    path = tmp_path / 'floats.json'
+    path.write_text('[12345.678, 1e-7, 3]')
+    assert list(JsonType(stream=True, chunk_size=1)(f'@{path}')) == [12345.678, 1e-7, 3]
@@ -0,0 +1,214 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from cloc.types import DateType
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2020-01-02', datetime(2020, 1, 2)),
+    ('2020-1-2', datetime(2020, 1, 2)),
+    ('2020-01-02 3:04:05', datetime(2020, 1, 2, 3, 4, 5)),
+    ('2020-01-02T03:04:05', datetime(2020, 1, 2, 3, 4, 5)),
+    ('2020-01-02T03:04:05+00:00', datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)),
+])
+def test_date_default_formats(value, expected):
+    assert DateType()(value) == expected
+
+
+def test_date_parsers_in_priority_order():
+    date = DateType(formats=('%d/%m/%Y',), epoch=True)
+    assert date('02/01/2020') == datetime(2020, 1, 2)
+    assert date('0') == datetime(1970, 1, 1, tzinfo=timezone.utc)
+    assert date('2020-01-02') == datetime(2020, 1, 2)
+
+
+def test_date_ambiguous_value_after_another_format():
+    date = DateType(epoch=True, formats=('%Y%m%d',))
+    assert date('20240101') == datetime(2024, 1, 1)
+    assert date('1700000000') == datetime.fromtimestamp(1700000000, timezone.utc)
+    assert date('20240101') == datetime(2024, 1, 1)
+
+    date = DateType(formats=('%d/%m/%Y', '%m/%d/%Y')).memoize()
+    assert date('03/04/2020') == datetime(2020, 4, 3)
+    assert date('12/31/2020') == datetime(2020, 12, 31)
+    assert date('05/06/2020') == datetime(2020, 6, 5)
+    assert DateType(formats=('%d/%m/%Y', '%m/%d/%Y'))('04/03/2020') == datetime(2020, 3, 4)
+
+
+def test_date_invalid():
+    with pytest.raises(SystemExit):
+        DateType()('not a date')
+
+
+@pytest.mark.parametrize('decoder', [None, 'json'])
+def test_json_defaults_to_stdlib(decoder):
+    from cloc.types import JsonType
+
+    assert JsonType(decoder=decoder)('{"n": 123456789012345678901234567890}') == {'n': 123456789012345678901234567890}
+
+
+@pytest.mark.parametrize('decoder', [None, 'fastest'])
+def test_json_falls_back_to_stdlib(decoder):
+    from cloc.types import JsonType
+
+    value = JsonType(decoder=decoder)('[NaN]')[0]
+    assert value != value
+
+
+def test_json_from_file(tmp_path):
+    from cloc.types import JsonType
+
+    path = tmp_path / 'body.json'
+    path.write_text('{"a": [1, 2]}')
+    assert JsonType()(f'@{path}') == {'a': [1, 2]}
+    with pytest.raises(SystemExit):
+        JsonType()('{"a": ')
+
+
+def test_file_modes(tmp_path):
+    from cloc.types import FileType
+
+    path = tmp_path / 'body'
+    path.write_bytes(b'abcdefg')
+    with FileType()(str(path)) as fin:
+        assert fin.read() == 'abcdefg'
+    with FileType('binary')(str(path)) as fin:
+        assert fin.read() == b'abcdefg'
+    assert list(FileType('chunks', chunk_size=3)(str(path))) == [b'abc', b'def', b'g']
+    mapped = FileType('mmap')(str(path))
+    assert mapped[:] == b'abcdefg'
+    mapped.close()
+    with pytest.raises(SystemExit):
+        FileType()(str(tmp_path / 'missing'))
+    with pytest.raises(ValueError):
+        FileType('xml')
+
+
+SHA = 'ab' * 32
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 65, 1024 * 1024])
+def test_sha256_scan_across_chunks(tmp_path, chunk_size):
+    from cloc.types import SHA256_PATTERN, Sha256Type
+
+    path = tmp_path / 'hashes'
+    text = f'{SHA} x{"cd" * 32}\n{"0" * 130} {SHA}'
+    path.write_text(text)
+    expected = SHA256_PATTERN.findall(text)
+    assert Sha256Type(chunk_size=chunk_size)(str(path)) == expected
+    assert Sha256Type(chunk_size=chunk_size, dedup=True)(str(path)) == [SHA, 'cd' * 32, '0' * 64]
+    assert list(Sha256Type(mmap=True, lazy=True)(str(path))) == expected
+
+
+def test_sha256_value():
+    from cloc.types import Sha256Type
+
+    assert Sha256Type()(SHA) == SHA
+    with pytest.raises(SystemExit):
+        Sha256Type()('ab')
+
+
+def test_digest_of_file(tmp_path):
+    import hashlib
+    from cloc.types import DigestType
+
+    path = tmp_path / 'body'
+    path.write_bytes(b'x' * 100001)
+    assert DigestType('md5', buffer_size=4096)(str(path)) == hashlib.md5(b'x' * 100001).hexdigest()
+    assert DigestType('md5')('0' * 32) == '0' * 32
+    with pytest.raises(SystemExit):
+        DigestType('md5')('0' * 31)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('5', list(range(5))),
+    ('2,10,3', list(range(2, 10, 3))),
+    ('1-5,10-12,30', [1, 2, 3, 4, 5, 10, 11, 12, 30]),
+    ('5-3', [5, 4, 3]),
+])
+def test_int_range(value, expected):
+    from cloc.types import IntRangeType
+
+    values = IntRangeType()(value)
+    assert list(values) == expected
+    assert len(values) == len(expected)
+    assert list(reversed(values)) == expected[::-1]
+    assert [values[i] for i in range(-len(expected), len(expected))] == expected * 2
+    assert all(v in values for v in expected) and max(expected) + 1 not in values
+
+
+@pytest.mark.parametrize('index', [slice(None), slice(2, None), slice(None, -2), slice(1, 8, 3), slice(None, None, -1),
+                                   slice(7, 1, -2), slice(100, None)])
+def test_multi_range_slices(index):
+    from cloc.types import IntRangeType
+
+    values = IntRangeType()('1-5,10-12,30')
+    assert list(values[index]) == list(values)[index]
+
+
+def test_int_range_large_is_lazy():
+    from cloc.types import IntRangeType
+
+    values = IntRangeType()('0-999999999999,5')
+    assert len(values) == 10 ** 12 + 1
+    assert values[-1] == 5 and values[10 ** 12 - 1] == 10 ** 12 - 1
+
+
+@pytest.mark.parametrize('value', ['a,b', '1,2,3,4', ''])
+def test_int_range_invalid(value):
+    from cloc.types import IntRangeType
+
+    with pytest.raises(SystemExit):
+        IntRangeType()(value)
+
+
+def test_int_array(tmp_path):
+    from array import array
+    from cloc.types import ArrayType
+
+    path = tmp_path / 'numbers'
+    path.write_text('4, 5\n6 7\n')
+    assert ArrayType('q').convert_many(['1,2', '3', f'@{path}']) == array('q', range(1, 8))
+    assert ArrayType('d')('1.5,2') == array('d', [1.5, 2.0])
+    assert ArrayType('q')([1, 2]) == array('q', [1, 2])
+    with pytest.raises(SystemExit):
+        ArrayType('q').convert_many(['1,x', 'y'])
+
+
+def test_memoize():
+    from cloc.types import IntRangeType, FileType
+
+    int_range = IntRangeType().memoize()
+    assert int_range('1-5') is int_range('1-5')
+    assert int_range.memo_stats()['hits'] == 1
+    assert IntRangeType().memo_stats() is None
+    assert FileType().memoize(0).memo_stats() is None
+
+
+def test_memoize_skips_files(tmp_path):
+    from cloc.types import FileType
+
+    path = tmp_path / 'text'
+    path.write_text('a')
+    file = FileType().memoize()
+    with file(str(path)) as first, file(str(path)) as second:
+        assert first is not second
+    assert file.memo_stats()['hits'] == 0
+
+
+def test_memoize_subclass_calls_once():
+    from cloc.types import IntRangeType
+
+    class Counted(IntRangeType):
+        calls = 0
+
+        def __call__(self, value):
+            Counted.calls += 1
+            return super().__call__(value)
+
+    counted = Counted().memoize()
+    counted('3')
+    counted('3')
+    assert Counted.calls == 1
+    assert counted.memo_stats()['currsize'] == 1
@@ -0,0 +1,46 @@
+import sys
+import threading
+
+from cloc.utils import CaptureSink, StdoutSink, capture, echo, use_sink
+
+
+def test_streams_are_restored_after_the_last_sink():
+    stdout, stderr = sys.stdout, sys.stderr
+    with capture() as (out, err):
+        with use_sink(CaptureSink()) as inner:
+            print('inner')
+        assert sys.stdout is not stdout
+        print('outer')
+    assert sys.stdout is stdout and sys.stderr is stderr
+    assert inner.getvalue() == 'inner\n'
+    assert out.getvalue() == 'outer\n'
+
+
+def test_sinks_are_per_thread():
+    results = {}
+    barrier = threading.Barrier(4)
+
+    def run(name: str):
+        with capture() as (out, _):
+            barrier.wait()
+            for i in range(100):
+                echo(f'{name} {i}')
+            barrier.wait()
+        results[name] = out.getvalue()
+
+    threads = [threading.Thread(target=run, args=(str(n),)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for name, output in results.items():
+        assert output == ''.join(f'{name} {i}\n' for i in range(100))
+
+
+def test_stdout_sink_buffers_and_strips_color():
+    target = CaptureSink()
+    sink = StdoutSink(target, buffer_size=1 << 20)
+    with use_sink(sink):
+        echo('colored', color='red')
+        assert target.getvalue() == ''
+    assert target.getvalue() == 'colored\n'
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+requests = pytest.importorskip('requests')
+
+from cloc.core import Grp, Params
+from cloc.utils import capture
+from cloc.viewsets import ReqSessionViewset
+
+BODY = b'x' * 200000
+# path: (status, body, seconds to wait before responding)
+STATIC = {'/fast': (200, b'{"speed": "fast"}', 0), '/slow': (200, b'{"speed": "slow"}', 0.3),
+          '/missing': (404, b'not found', 0), '/broken': (500, b'broken', 0)}
+
+
+class Handler(BaseHTTPRequestHandler):
+    """the first request of a path drops the connection halfway, /resume honours Range and /no-range ignores it.
+       The paths of STATIC always respond with their status and body
+    """
+    protocol_version = 'HTTP/1.1'
+    seen = set()
+
+    def do_GET(self):
+        if self.path in STATIC:
+            status, body, wait = STATIC[self.path]
+            time.sleep(wait)
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        resume = self.headers.get('Range') if self.path == '/resume' else None
+        start = int(resume.split('=')[1].rstrip('-')) if resume else 0
+        body = BODY[start:]
+        self.send_response(206 if resume else 200)
+        self.send_header('Content-Length', str(len(body)))
+        if resume:
+            self.send_header('Content-Range', f'bytes {start}-{len(BODY) - 1}/{len(BODY)}')
+        self.end_headers()
+        if self.path not in self.seen:
+            self.seen.add(self.path)
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # a dropped connection is what the tests are for
+        pass
+
+
+@pytest.fixture(scope='module')
+def base_url():
+    server = Server(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+def test_stream_resumes_with_range(base_url, tmp_path):
+    output = tmp_path / 'body'
+    ReqSessionViewset()._stream(f'{base_url}/resume', str(output), backoff=0)
+    assert output.read_bytes() == BODY
+
+
+def test_failed_resume_raises_without_writing_to_stdout(base_url):
+    with capture() as (out, _):
+        with pytest.raises(requests.RequestException, match='can not be resumed'):
+            for _ in ReqSessionViewset()._iter_content(f'{base_url}/no-range', backoff=0):
+                pass
+    assert out.getvalue() == ''
+
+
+def get_many(cmdl: list) -> tuple:
+    """invoke get-many through a Grp, returns the exit code, the records and stderr"""
+    cli = Grp('cli', lambda: None, params=Params())
+    cli.add_command(ReqSessionViewset(max_retries=0))
+    code = 0
+    with capture() as (out, err):
+        try:
+            cli(['get-many'] + cmdl)
+        except SystemExit as e:
+            code = e.code
+    return code, [json.loads(line) for line in out.getvalue().splitlines()], err.getvalue()
+
+
+def test_get_many_writes_records_as_they_complete(base_url):
+    code, records, err = get_many(['-u', f'{base_url}/slow', '-u', f'{base_url}/fast', '-w', '2'])
+    assert code == 0
+    assert [r['body'] for r in records] == [{'speed': 'fast'}, {'speed': 'slow'}]
+    assert all(r['status'] == 200 and 'error' not in r for r in records)
+    assert '2 requests, 0 failed' in err and 'latency ms: min' in err
+
+
+def test_get_many_error_records_exit_with_1(base_url, tmp_path):
+    urls = tmp_path / 'urls'
+    urls.write_text(f'# comment\n{base_url}/fast\nnot a url\n{base_url}/missing\n{base_url}/broken\n')
+    code, records, err = get_many(['-f', str(urls)])
+    assert code == 1
+    errors = {r['url']: r.get('error') for r in records}
+    assert errors == {f'{base_url}/fast': None, 'not a url': "'not a url' is not a valid URL",
+                      f'{base_url}/missing': '404 Not Found', f'{base_url}/broken': '500 Internal Server Error'}
+    assert '4 requests, 3 failed' in err